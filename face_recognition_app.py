@@ -7,10 +7,11 @@ import tkinter as tk
 import sys
 import os
 
-# Add project directory to path
-project_dir = os.path.abspath('.')
+# Add project directory (where this file lives, not the working directory)
+# to the front of the path - usually already there as the script's directory
+project_dir = os.path.dirname(os.path.abspath(__file__))
 if project_dir not in sys.path:
-    sys.path.append(project_dir)
+    sys.path.insert(0, project_dir)
 
 # Import main window
 from src.ui.main_window import MainWindow
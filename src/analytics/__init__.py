@@ -4,11 +4,19 @@ Big Data Analytics module for Face Recognition System
 Provides Spark-based distributed analytics capabilities
 """
 
-try:
-    from .spark_analytics import SparkAnalyticsEngine
-    SPARK_AVAILABLE = True
-except ImportError:
-    SPARK_AVAILABLE = False
-    SparkAnalyticsEngine = None
+def __getattr__(name):
+    """Import the analytics engine (pandas, PySpark) on first access only"""
+    if name not in ('SparkAnalyticsEngine', 'SPARK_AVAILABLE'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    try:
+        from .spark_analytics import SparkAnalyticsEngine
+        SPARK_AVAILABLE = True
+    except ImportError:
+        SPARK_AVAILABLE = False
+        SparkAnalyticsEngine = None
+    
+    globals().update(SparkAnalyticsEngine=SparkAnalyticsEngine, SPARK_AVAILABLE=SPARK_AVAILABLE)
+    return globals()[name]
 
-__all__ = ['SparkAnalyticsEngine', 'SPARK_AVAILABLE']
\ No newline at end of file
+__all__ = ['SparkAnalyticsEngine', 'SPARK_AVAILABLE']
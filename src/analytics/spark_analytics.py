@@ -9,10 +9,139 @@ import warnings
 import sys
 import os
 import tempfile
-import subprocess
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from ..database.database_manager import get_database_manager
+
+# PySpark is optional - without it every analysis runs on pandas.
+# SKIP_SPARK=1 skips importing and starting it (no JVM start-up at all)
+SKIP_SPARK = os.environ.get('SKIP_SPARK', '').lower() in ('1', 'true', 'yes')
+
+PYSPARK_AVAILABLE = False
+if not SKIP_SPARK:
+    try:
+        from pyspark.sql import SparkSession
+        from pyspark.conf import SparkConf
+        from pyspark.sql.functions import count, avg, countDistinct
+        PYSPARK_AVAILABLE = True
+    except ImportError:
+        pass
 
 warnings.filterwarnings('ignore')
 
+# Weekday order used for day_of_week categoricals
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# The only document fields the analyses read - everything else stays on the server
+EVENT_FIELDS = ("name", "confidence", "timestamp")
+ATTENDANCE_FIELDS = ("employee_name", "enter_time", "is_late")
+
+# Windows install locations searched for a jdk-11* directory when no Java is configured
+JDK_SEARCH_DIRS = (
+    r"C:\Program Files\Java",
+    r"C:\Program Files\Eclipse Adoptium",
+    r"C:\Program Files\OpenJDK",
+)
+
+# Last comprehensive report, reused while the source collections are unchanged:
+# report.json holds the layout and data version, each table is a Parquet file
+# beside it. Anchored to the project root so it does not depend on the cwd
+ANALYTICS_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".analytics_cache"
+)
+
+# Bumped whenever the report layout changes, so older cache files are ignored
+REPORT_FORMAT = 4
+
+def collection_version(collection):
+    """
+    Newest _id (as a string) and exact document count of a collection
+    
+    count_documents({}) is a full count on the server, unlike the
+    metadata-based estimated_document_count(), which can be stale (e.g.
+    after an unclean shutdown) and would let deletions go unnoticed. It is
+    the one exact count per analytics run - the incremental load reuses it.
+    """
+    latest = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    return [str(latest["_id"]) if latest else None, collection.count_documents({})]
+
+def get_data_version():
+    """
+    Fingerprint of the analytics source data
+    
+    Returns collection_version() of the events and attendance collections,
+    or None if MongoDB cannot be reached.
+    """
+    try:
+        db_manager = get_database_manager()
+        return [collection_version(db_manager.get_collection(name))
+                for name in ("recognition_events", "attendance")]
+    
+    except Exception as e:
+        print(f"⚠️ Could not check analytics data version: {e}")
+        return None
+
+def load_cached_report(data_version, cache_dir=ANALYTICS_CACHE_DIR):
+    """Return the cached report if it was built from data_version, else None"""
+    index_path = os.path.join(cache_dir, "report.json")
+    if data_version is None or not os.path.exists(index_path):
+        return None
+    
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("format") != REPORT_FORMAT or index.get("version") != data_version:
+            return None
+        
+        def restore(value):
+            if isinstance(value, dict):
+                if "__table__" in value:
+                    return pd.read_parquet(os.path.join(cache_dir, os.path.basename(value["__table__"])))
+                return {key: restore(item) for key, item in value.items()}
+            return value
+        
+        return restore(index["report"])
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable analytics cache: {e}")
+        return None
+
+def save_cached_report(data_version, report, cache_dir=ANALYTICS_CACHE_DIR):
+    """Store a report together with the data version it was built from"""
+    if data_version is None:
+        return
+    
+    index_path = os.path.join(cache_dir, "report.json")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Drop the old index first so a half-written cache is never loaded
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        
+        def store(value, name):
+            if isinstance(value, pd.DataFrame):
+                filename = f"{name}.parquet"
+                value.to_parquet(os.path.join(cache_dir, filename))
+                return {"__table__": filename}
+            if isinstance(value, dict):
+                return {key: store(item, f"{name}_{key}") for key, item in value.items()}
+            return value
+        
+        index = {
+            "format": REPORT_FORMAT,
+            "version": data_version,
+            "report": {section: store(data, section) for section, data in report.items()}
+        }
+        
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except Exception as e:
+        print(f"⚠️ Could not write analytics cache: {e}")
+
 class SparkAnalyticsEngine:
     """Analytics engine with improved Windows Spark support"""
     
@@ -21,6 +150,31 @@ class SparkAnalyticsEngine:
         self.use_spark = False
         self.spark = None
         
+        # MongoDB data loaded so far, extended incrementally on each load
+        self._db_events_df = pd.DataFrame()
+        self._db_attendance_df = pd.DataFrame()
+        self._last_loaded_ids = {}
+        
+        # True while the analysed data is the generated demo set
+        self.using_sample_data = False
+        
+        # Spark start-up (JVM launch) runs in the background so it overlaps
+        # with the MongoDB load; _wait_for_spark() joins it before analysis
+        self._spark_future = None
+        
+        if SKIP_SPARK:
+            print("⏭️ Spark disabled (SKIP_SPARK), using pandas")
+            return
+        if not PYSPARK_AVAILABLE:
+            print("⚠️ PySpark not installed, using pandas")
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._spark_future = executor.submit(self._start_spark, app_name)
+        executor.shutdown(wait=False)
+    
+    def _start_spark(self, app_name):
+        """Set up the environment and start Spark, falling back to pandas on failure"""
         try:
             print("🔧 Setting up Windows Spark environment...")
             self._setup_windows_spark_environment()
@@ -29,6 +183,12 @@ class SparkAnalyticsEngine:
             print(f"⚠️ Spark failed, using pandas: {str(e)[:50]}...")
             self.use_spark = False
     
+    def _wait_for_spark(self):
+        """Block until the background Spark start-up has finished"""
+        if self._spark_future is not None:
+            self._spark_future.result()
+            self._spark_future = None
+    
     def _setup_windows_spark_environment(self):
         """Enhanced Windows environment setup using your Hadoop installation"""
         
@@ -39,7 +199,7 @@ class SparkAnalyticsEngine:
         
         # Use your existing Hadoop installation
         hadoop_home = r"C:\hadoop-3.0.0"
-        if os.path.exists(hadoop_home):
+        if os.path.isdir(hadoop_home):
             os.environ['HADOOP_HOME'] = hadoop_home
             os.environ['HADOOP_CONF_DIR'] = os.path.join(hadoop_home, 'etc', 'hadoop')
             
@@ -53,15 +213,28 @@ class SparkAnalyticsEngine:
         else:
             print("⚠️ Hadoop not found at expected location")
         
-        # Java setup - you have jdk-11
-        java_home = r"C:\Program Files\Java\jdk-11"
-        if os.path.exists(java_home):
-            os.environ['JAVA_HOME'] = java_home
-            java_bin = os.path.join(java_home, 'bin')
-            current_path = os.environ.get('PATH', '')
-            if java_bin not in current_path:
-                os.environ['PATH'] = f"{java_bin};{current_path}"
+        # Java setup - keep an already configured Java (JAVA_HOME or java on PATH)
+        java_home = os.environ.get('JAVA_HOME')
+        java_exe = 'java.exe' if os.name == 'nt' else 'java'
+        java_on_path = None
+        if not (java_home and os.path.isfile(os.path.join(java_home, 'bin', java_exe))):
+            java_home = None
+            java_on_path = shutil.which('java')
+        
+        if java_home:
             print(f"✅ Using Java: {java_home}")
+        elif java_on_path:
+            print(f"✅ Using Java: {java_on_path}")
+        else:
+            # Fall back to a local jdk-11 install
+            java_home = self._find_jdk(java_exe)
+            if java_home:
+                os.environ['JAVA_HOME'] = java_home
+                java_bin = os.path.join(java_home, 'bin')
+                current_path = os.environ.get('PATH', '')
+                if java_bin not in current_path:
+                    os.environ['PATH'] = f"{java_bin};{current_path}"
+                print(f"✅ Using Java: {java_home}")
         
         # Spark specific Windows settings
         os.environ['SPARK_LOCAL_IP'] = '127.0.0.1'
@@ -76,11 +249,29 @@ class SparkAnalyticsEngine:
         
         print("✅ Windows Spark environment configured")
     
+    def _find_jdk(self, java_exe):
+        """
+        First jdk-11* directory under the JDK_SEARCH_DIRS locations, or None
+        
+        Directories without bin/<java_exe> (left over from upgrades) are skipped.
+        """
+        for base in JDK_SEARCH_DIRS:
+            # One directory listing per location instead of a stat per candidate
+            try:
+                with os.scandir(base) as entries:
+                    jdks = sorted(
+                        entry.path for entry in entries
+                        if entry.name.startswith("jdk-11") and entry.is_dir()
+                        and os.path.isfile(os.path.join(entry.path, 'bin', java_exe))
+                    )
+            except OSError:
+                continue
+            if jdks:
+                return jdks[0]
+        return None
+    
     def _init_spark_with_hadoop(self, app_name):
         """Initialize Spark with Hadoop and Windows optimizations"""
-        from pyspark.sql import SparkSession
-        from pyspark.conf import SparkConf
-        
         # Create optimized Spark configuration for Windows
         conf = SparkConf()
         conf.set("spark.app.name", app_name)
@@ -91,16 +282,22 @@ class SparkAnalyticsEngine:
         
         # Windows specific configurations
         conf.set("spark.serializer", "org.apache.spark.serializer.KryoSerializer")
-        conf.set("spark.sql.execution.arrow.pyspark.enabled", "false")
         conf.set("spark.sql.adaptive.enabled", "false")  # Disable adaptive for stability
         conf.set("spark.dynamicAllocation.enabled", "false")
         
+        # Arrow for the pandas <-> Spark conversions (createDataFrame/toPandas),
+        # falling back to row-by-row conversion if pyarrow is missing or fails
+        conf.set("spark.sql.execution.arrow.pyspark.enabled", "true")
+        conf.set("spark.sql.execution.arrow.pyspark.fallback.enabled", "true")
+        
         # Network and communication settings
         conf.set("spark.driver.bindAddress", "127.0.0.1")
         conf.set("spark.driver.host", "127.0.0.1")
         conf.set("spark.blockManager.port", "0")  # Let Spark choose available ports
         conf.set("spark.driver.port", "0")
-        conf.set("spark.ui.port", "0")
+        
+        # No web UI - skips starting its Jetty server with the session
+        conf.set("spark.ui.enabled", "false")
         
         # Reduce parallelism to minimize socket communication
         conf.set("spark.sql.shuffle.partitions", "1")
@@ -121,9 +318,8 @@ class SparkAnalyticsEngine:
         # Test with minimal operation
         try:
             test_rdd = self.spark.sparkContext.parallelize([1, 2, 3], 1)
-            count = test_rdd.count()
             
-            if count == 3:
+            if test_rdd.count() == 3:
                 self.use_spark = True
                 print("✅ Spark Analytics Engine initialized with Hadoop support")
             else:
@@ -133,51 +329,46 @@ class SparkAnalyticsEngine:
             print(f"⚠️ Spark test failed: {test_error}")
             raise test_error
     
-    def load_data_from_mongodb(self):
-        """Load data from MongoDB"""
+    def load_data_from_mongodb(self, data_version=None):
+        """
+        Load data from MongoDB (only documents added since the last load)
+        
+        Args:
+            data_version: get_data_version() result taken just before, if
+                any - its exact counts let the incremental load spot deleted
+                or out-of-order documents without counting again
+        """
         try:
-            from ..database.database_manager import get_database_manager
-            
             db_manager = get_database_manager()
             events_collection = db_manager.get_collection("recognition_events")
             attendance_collection = db_manager.get_collection("attendance")
-            
-            events_data = list(events_collection.find())
-            attendance_data = list(attendance_collection.find())
-            
-            # Process events
-            if events_data:
-                for event in events_data:
-                    if '_id' in event:
-                        del event['_id']
-                
-                self.events_df = pd.DataFrame(events_data)
-                if 'timestamp' in self.events_df.columns:
-                    self.events_df['timestamp'] = pd.to_datetime(self.events_df['timestamp'])
-                    self.events_df['hour'] = self.events_df['timestamp'].dt.hour
-                    self.events_df['day_of_week'] = self.events_df['timestamp'].dt.day_name()
-            else:
-                self.events_df = pd.DataFrame()
-            
-            # Process attendance
-            if attendance_data:
-                for attendance in attendance_data:
-                    if '_id' in attendance:
-                        del attendance['_id']
-                
-                self.attendance_df = pd.DataFrame(attendance_data)
-                if 'enter_time' in self.attendance_df.columns:
-                    self.attendance_df['enter_time'] = pd.to_datetime(self.attendance_df['enter_time'])
-                    self.attendance_df['day_of_week'] = self.attendance_df['enter_time'].dt.day_name()
-            else:
-                self.attendance_df = pd.DataFrame()
+            events_version, attendance_version = data_version or (None, None)
+            
+            # Read both collections concurrently - the round-trips overlap
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                events_future = executor.submit(
+                    self._load_new_documents,
+                    events_collection, "recognition_events", self._db_events_df,
+                    self._events_frame, EVENT_FIELDS, events_version
+                )
+                attendance_future = executor.submit(
+                    self._load_new_documents,
+                    attendance_collection, "attendance", self._db_attendance_df,
+                    self._attendance_frame, ATTENDANCE_FIELDS, attendance_version
+                )
+                self._db_events_df = events_future.result()
+                self._db_attendance_df = attendance_future.result()
+            
+            self.events_df = self._db_events_df
+            self.attendance_df = self._db_attendance_df
+            self.using_sample_data = False
             
             # Add sample data if needed
-            if len(events_data) < 50:
+            if len(self.events_df) < 50:
                 print("📊 Adding sample data for demonstration...")
                 self._create_sample_data()
             else:
-                print(f"📊 Loaded: {len(events_data)} events, {len(attendance_data)} attendance")
+                print(f"📊 Loaded: {len(self.events_df)} events, {len(self.attendance_df)} attendance")
             
             return True
             
@@ -186,46 +377,100 @@ class SparkAnalyticsEngine:
             self._create_sample_data()
             return False
     
+    def _load_new_documents(self, collection, key, loaded_df, to_frame, fields, version=None):
+        """
+        Append documents with _id above the last one seen to loaded_df
+        
+        Only _id and the given fields are fetched. Falls back to a full reload
+        when what has been loaded no longer matches the collection:
+        - the last loaded document is gone (indexed point lookup), or
+        - loaded plus new documents up to the version's newest _id do not
+          add up to its exact count (version is this collection's
+          collection_version() entry; deleted documents or out-of-order
+          inserts). Documents added after the version was taken are not
+          counted, so ongoing inserts do not force a reload. Without version
+          only the first check runs - no second full count is made here.
+        """
+        last_id = self._last_loaded_ids.get(key)
+        if last_id is not None and collection.find_one({"_id": last_id}, {"_id": 1}) is None:
+            last_id = None
+        
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        projection = dict.fromkeys(fields, 1)
+        documents = list(collection.find(query, projection).sort("_id", 1))
+        
+        if last_id is not None and version is not None:
+            newest, total = version
+            counted = sum(1 for document in documents if str(document["_id"]) <= newest) if newest else 0
+            if len(loaded_df) + counted != total:
+                last_id = None
+                documents = list(collection.find({}, projection).sort("_id", 1))
+        
+        if last_id is None:
+            self._last_loaded_ids.pop(key, None)
+            loaded_df = pd.DataFrame()
+        if not documents:
+            return loaded_df
+        
+        self._last_loaded_ids[key] = documents[-1]["_id"]
+        for document in documents:
+            del document["_id"]
+        
+        new_df = to_frame(documents)
+        if loaded_df.empty:
+            return new_df
+        return pd.concat([loaded_df, new_df], ignore_index=True)
+    
+    @staticmethod
+    def _events_frame(events_data):
+        """Recognition events as a DataFrame with hour and weekday columns"""
+        events_df = pd.DataFrame(events_data)
+        if 'timestamp' in events_df.columns:
+            events_df['timestamp'] = pd.to_datetime(events_df['timestamp'])
+            events_df['hour'] = events_df['timestamp'].dt.hour
+            events_df['day_of_week'] = events_df['timestamp'].dt.day_name()
+        return events_df
+    
+    @staticmethod
+    def _attendance_frame(attendance_data):
+        """Attendance records as a DataFrame with a weekday column"""
+        attendance_df = pd.DataFrame(attendance_data)
+        if 'enter_time' in attendance_df.columns:
+            attendance_df['enter_time'] = pd.to_datetime(attendance_df['enter_time'])
+            attendance_df['day_of_week'] = attendance_df['enter_time'].dt.day_name()
+        return attendance_df
+    
     def _create_sample_data(self):
         """Create sample data"""
         print("🔧 Generating sample data...")
+        self.using_sample_data = True
         
         np.random.seed(42)
         employees = ["John_Doe", "Jane_Smith", "Mike_Wilson", "Sarah_Johnson", "David_Brown"]
-        start_date = datetime.now() - timedelta(days=30)
-        
-        # Events data
-        events_data = []
-        for i in range(200):  # Smaller dataset for testing
-            day_offset = int(np.random.randint(0, 30))
-            hour = int(np.random.choice([8, 9, 17, 18]))
-            event_time = start_date + timedelta(days=day_offset, hours=hour)
-            
-            events_data.append({
-                "name": str(np.random.choice(employees)),
-                "confidence": float(np.random.uniform(0.7, 0.95)),
-                "timestamp": event_time,
-                "hour": int(event_time.hour),
-                "day_of_week": event_time.strftime("%A")
-            })
-        
-        self.events_df = pd.DataFrame(events_data)
-        
-        # Attendance data
-        attendance_data = []
-        for i in range(50):  # Smaller dataset
-            attend_date = start_date + timedelta(days=int(np.random.randint(0, 30)))
-            hour = int(np.random.choice([8, 9]))
-            attend_time = attend_date.replace(hour=hour)
-            
-            attendance_data.append({
-                "employee_name": str(np.random.choice(employees)),
-                "enter_time": attend_time,
-                "is_late": bool(hour >= 9),
-                "day_of_week": attend_time.strftime("%A")
-            })
-        
-        self.attendance_df = pd.DataFrame(attendance_data)
+        
+        # The 30 days the samples are spread over, as one datetime64 array
+        days = pd.date_range(datetime.now() - timedelta(days=30), periods=30, freq='D')
+        
+        # Events data - one vectorized draw per column
+        n_events = 200  # Smaller dataset for testing
+        event_times = days[np.random.randint(0, 30, size=n_events)] + pd.to_timedelta(
+            np.random.choice([8, 9, 17, 18], size=n_events), unit='h'
+        )
+        self.events_df = self._events_frame({
+            "name": np.random.choice(employees, size=n_events),
+            "confidence": np.random.uniform(0.7, 0.95, size=n_events),
+            "timestamp": event_times
+        })
+        
+        # Attendance data - arrival at 8:xx or 9:xx (late) on random days
+        n_attendance = 50  # Smaller dataset
+        attend_dates = days[np.random.randint(0, 30, size=n_attendance)]
+        hours = np.random.choice([8, 9], size=n_attendance)
+        self.attendance_df = self._attendance_frame({
+            "employee_name": np.random.choice(employees, size=n_attendance),
+            "enter_time": attend_dates + pd.to_timedelta(hours - attend_dates.hour, unit='h'),
+            "is_late": hours >= 9
+        })
         print(f"✅ Generated {len(self.events_df)} events, {len(self.attendance_df)} attendance")
     
     def safe_format_number(self, value, format_type="int"):
@@ -245,6 +490,20 @@ class SparkAnalyticsEngine:
         except (ValueError, TypeError):
             return "N/A"
     
+    @staticmethod
+    def _sanitize(df, int_columns=(), float_columns=()):
+        """
+        Coerce result columns to int64 / float64 in place, one pass per column
+        
+        Values that are missing or not numeric become 0, so formatting the
+        results never has to deal with bad values.
+        """
+        for column in int_columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype('int64')
+        for column in float_columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0.0).astype('float64')
+        return df
+    
     def analyze_peak_hours(self):
         """Analyze peak hours with optimized Spark operations"""
         print("📈 Analyzing peak hours...")
@@ -252,6 +511,8 @@ class SparkAnalyticsEngine:
         if self.events_df.empty:
             return pd.DataFrame()
         
+        self._wait_for_spark()
+        
         try:
             if self.use_spark and self.spark:
                 try:
@@ -263,8 +524,6 @@ class SparkAnalyticsEngine:
                     # Create Spark DataFrame with single partition
                     spark_df = self.spark.createDataFrame(spark_data).coalesce(1)
                     
-                    from pyspark.sql.functions import count, avg, countDistinct
-                    
                     # Simple aggregation to minimize shuffling
                     result = spark_df.groupBy("hour").agg(
                         count("*").alias("recognition_count"),
@@ -276,9 +535,8 @@ class SparkAnalyticsEngine:
                     pandas_result = result.toPandas()
                     
                     # Fix data types
-                    pandas_result['recognition_count'] = pandas_result['recognition_count'].astype(int)
-                    pandas_result['avg_confidence'] = pandas_result['avg_confidence'].astype(float).round(3)
-                    pandas_result['unique_people'] = pandas_result['unique_people'].astype(int)
+                    self._sanitize(pandas_result, ['hour', 'recognition_count', 'unique_people'], ['avg_confidence'])
+                    pandas_result['avg_confidence'] = pandas_result['avg_confidence'].round(3)
                     
                     print("✅ Spark peak hours analysis completed")
                     return pandas_result
@@ -289,21 +547,14 @@ class SparkAnalyticsEngine:
             
             # Pandas fallback
             print("🐼 Using pandas for peak hours analysis...")
-            result = self.events_df.groupby('hour').agg({
-                'name': ['count', 'nunique'],
-                'confidence': 'mean'
-            }).round(3)
-            
-            result.columns = ['recognition_count', 'unique_people', 'avg_confidence']
-            result = result.reset_index()
+            result = self.events_df.groupby('hour').agg(
+                recognition_count=('name', 'count'),
+                unique_people=('name', 'nunique'),
+                avg_confidence=('confidence', 'mean')
+            ).round(3).reset_index()
             
             # Fix data types
-            result['hour'] = result['hour'].astype(int)
-            result['recognition_count'] = result['recognition_count'].astype(int)
-            result['unique_people'] = result['unique_people'].astype(int)
-            result['avg_confidence'] = result['avg_confidence'].astype(float).round(3)
-            
-            return result
+            return self._sanitize(result, ['hour', 'recognition_count', 'unique_people'], ['avg_confidence'])
             
         except Exception as e:
             print(f"Error in peak hours: {e}")
@@ -317,19 +568,21 @@ class SparkAnalyticsEngine:
             return pd.DataFrame()
         
         try:
-            daily_stats = self.attendance_df.groupby('day_of_week').agg({
-                'employee_name': ['count', 'nunique'],
-                'is_late': 'sum'
-            })
+            # Group on an ordered categorical so days come out Monday..Sunday
+            day_of_week = pd.Categorical(
+                self.attendance_df['day_of_week'], categories=WEEKDAYS, ordered=True
+            )
+            daily_stats = self.attendance_df.groupby(day_of_week, observed=True).agg(
+                total_attendance=('employee_name', 'count'),
+                unique_employees=('employee_name', 'nunique'),
+                late_count=('is_late', 'sum')
+            )
+            daily_stats.index.name = 'day_of_week'
             
-            daily_stats.columns = ['total_attendance', 'unique_employees', 'late_count']
             daily_stats['late_percentage'] = (daily_stats['late_count'] / daily_stats['total_attendance'] * 100).round(2)
             
             # Fix data types
-            daily_stats['total_attendance'] = daily_stats['total_attendance'].astype(int)
-            daily_stats['unique_employees'] = daily_stats['unique_employees'].astype(int)
-            daily_stats['late_count'] = daily_stats['late_count'].astype(int)
-            daily_stats['late_percentage'] = daily_stats['late_percentage'].astype(float)
+            self._sanitize(daily_stats, ['total_attendance', 'unique_employees', 'late_count'], ['late_percentage'])
             
             return daily_stats.reset_index()
             
@@ -345,27 +598,120 @@ class SparkAnalyticsEngine:
             return pd.DataFrame()
         
         try:
-            emp_stats = self.attendance_df.groupby('employee_name').agg({
-                'employee_name': 'count',
-                'is_late': 'sum',
-                'enter_time': lambda x: x.dt.hour.mean()
-            }).round(2)
+            # Groups stay unsorted - the result is ordered by score below
+            emp_stats = self.attendance_df.assign(
+                arrival_hour=self.attendance_df['enter_time'].dt.hour
+            ).groupby('employee_name', sort=False).agg(
+                total_days=('employee_name', 'count'),
+                late_days=('is_late', 'sum'),
+                avg_arrival_hour=('arrival_hour', 'mean')
+            ).round(2)
             
-            emp_stats.columns = ['total_days', 'late_days', 'avg_arrival_hour']
             emp_stats['punctuality_score'] = ((emp_stats['total_days'] - emp_stats['late_days']) / emp_stats['total_days'] * 100).round(2)
             
             # Fix data types
-            emp_stats['total_days'] = emp_stats['total_days'].astype(int)
-            emp_stats['late_days'] = emp_stats['late_days'].astype(int)
-            emp_stats['avg_arrival_hour'] = emp_stats['avg_arrival_hour'].astype(float).round(1)
-            emp_stats['punctuality_score'] = emp_stats['punctuality_score'].astype(float)
+            self._sanitize(emp_stats, ['total_days', 'late_days'], ['avg_arrival_hour', 'punctuality_score'])
+            emp_stats['avg_arrival_hour'] = emp_stats['avg_arrival_hour'].round(1)
             
-            return emp_stats.sort_values('punctuality_score', ascending=False).reset_index()
+            return emp_stats.sort_values(
+                ['punctuality_score', 'employee_name'], ascending=[False, True]
+            ).reset_index()
             
         except Exception as e:
             print(f"Error in employee performance: {e}")
             return pd.DataFrame()
     
+    def summarize_peak_hours(self, peak_hours):
+        """
+        Precompute everything the peak hours view shows
+        
+        Returns a dict with the full table ('hours'), the busiest hour, the
+        top 10 hours by recognition count and the overall totals.
+        """
+        if peak_hours.empty:
+            return {"hours": peak_hours}
+        
+        # Fixed schema - read the busiest hour from the column arrays by
+        # position instead of building a (dtype-upcast) row Series
+        counts = peak_hours['recognition_count'].to_numpy()
+        peak = counts.argmax()
+        
+        top10 = peak_hours.nlargest(10, 'recognition_count')
+        totals = peak_hours.agg({'recognition_count': 'sum', 'avg_confidence': 'mean'})
+        
+        return {
+            "hours": peak_hours,
+            "top10": top10,
+            "peak_hour": int(peak_hours['hour'].to_numpy()[peak]),
+            "peak_count": int(counts[peak]),
+            "peak_confidence": float(peak_hours['avg_confidence'].to_numpy()[peak]),
+            "peak_people": int(peak_hours['unique_people'].to_numpy()[peak]),
+            "total_recognitions": int(totals['recognition_count']),
+            "avg_confidence": float(totals['avg_confidence'])
+        }
+    
+    def summarize_daily_patterns(self, daily_patterns):
+        """
+        Precompute everything the daily patterns view shows
+        
+        Returns a dict with the full table ('days'), the busiest day, the
+        days with the highest and lowest late rate and the weekly averages.
+        """
+        if daily_patterns.empty:
+            return {"days": daily_patterns}
+        
+        # Positional argmax/argmin on the raw arrays
+        day_names = daily_patterns['day_of_week'].to_numpy()
+        total_attendance = daily_patterns['total_attendance'].to_numpy()
+        late_percentage = daily_patterns['late_percentage'].to_numpy()
+        busiest = total_attendance.argmax()
+        highest_late = late_percentage.argmax()
+        averages = daily_patterns.agg({'total_attendance': 'mean', 'late_percentage': 'mean'})
+        
+        return {
+            "days": daily_patterns,
+            "busiest_day": str(day_names[busiest]),
+            "busiest_total": int(total_attendance[busiest]),
+            "busiest_unique": int(daily_patterns['unique_employees'].to_numpy()[busiest]),
+            "busiest_late": float(late_percentage[busiest]),
+            "highest_late_day": str(day_names[highest_late]),
+            "highest_late_rate": float(late_percentage[highest_late]),
+            "most_punctual_day": str(day_names[late_percentage.argmin()]),
+            "avg_attendance": float(averages['total_attendance']),
+            "avg_late_rate": float(averages['late_percentage'])
+        }
+    
+    def summarize_employee_performance(self, emp_stats):
+        """
+        Precompute everything the employee performance view shows
+        
+        Returns a dict with the full table ('employees'), the top 10 rows,
+        the best performer, the punctuality buckets (excellent >95,
+        good 85-95, needs improvement <85) and the summary averages.
+        """
+        if emp_stats.empty:
+            return {"employees": emp_stats}
+        
+        scores = emp_stats['punctuality_score']
+        top10 = emp_stats.nlargest(10, 'punctuality_score')
+        
+        # One binning pass; nextafter keeps exactly 85 in the 'good' bucket
+        buckets = pd.cut(
+            scores,
+            [-np.inf, np.nextafter(85, -np.inf), 95, np.inf],
+            labels=['needs_improvement', 'good', 'excellent']
+        ).value_counts()
+        
+        return {
+            "employees": emp_stats,
+            "top10": top10,
+            "best": (str(top10['employee_name'].iat[0]), float(top10['punctuality_score'].iat[0])),
+            "buckets": (int(buckets['excellent']), int(buckets['good']), int(buckets['needs_improvement'])),
+            "avg_punctuality": float(scores.mean()),
+            "avg_arrival": float(emp_stats['avg_arrival_hour'].mean()),
+            "total_records": int(emp_stats['total_days'].sum())
+        }
+    
     def analyze_recognition_accuracy_trends(self):
         """Analyze accuracy trends"""
         print("🎯 Analyzing accuracy trends...")
@@ -376,18 +722,18 @@ class SparkAnalyticsEngine:
         try:
             self.events_df['week'] = self.events_df['timestamp'].dt.isocalendar().week
             
-            weekly_stats = self.events_df.groupby('week').agg({
-                'name': 'count',
-                'confidence': ['mean', 'min', 'max', 'std']
-            }).round(3)
-            
-            weekly_stats.columns = ['total_recognitions', 'avg_confidence', 'min_confidence', 'max_confidence', 'confidence_std']
-            weekly_stats = weekly_stats.fillna(0)
+            weekly_stats = self.events_df.groupby('week').agg(
+                total_recognitions=('name', 'count'),
+                avg_confidence=('confidence', 'mean'),
+                min_confidence=('confidence', 'min'),
+                max_confidence=('confidence', 'max'),
+                confidence_std=('confidence', 'std')
+            ).round(3).fillna(0)
             
             # Fix data types
-            weekly_stats['total_recognitions'] = weekly_stats['total_recognitions'].astype(int)
-            for col in ['avg_confidence', 'min_confidence', 'max_confidence', 'confidence_std']:
-                weekly_stats[col] = weekly_stats[col].astype(float).round(3)
+            float_columns = ['avg_confidence', 'min_confidence', 'max_confidence', 'confidence_std']
+            self._sanitize(weekly_stats, ['total_recognitions'], float_columns)
+            weekly_stats[float_columns] = weekly_stats[float_columns].round(3)
             
             return weekly_stats.reset_index()
             
@@ -413,16 +759,14 @@ class SparkAnalyticsEngine:
             recent_events = recent_events.copy()
             recent_events['date'] = recent_events['timestamp'].dt.date
 
-            realtime_stats = recent_events.groupby(['date', 'name', 'day_of_week']).agg({
-                'name': 'count',
-                'confidence': 'mean'
-            }).round(3)
-
-            realtime_stats.columns = ['recognition_frequency', 'avg_confidence']
+            realtime_stats = recent_events.groupby(['date', 'name', 'day_of_week']).agg(
+                recognition_frequency=('confidence', 'size'),
+                avg_confidence=('confidence', 'mean')
+            ).round(3)
 
             # Fix data types
-            realtime_stats['recognition_frequency'] = realtime_stats['recognition_frequency'].astype(int)
-            realtime_stats['avg_confidence'] = realtime_stats['avg_confidence'].astype(float).round(3)
+            self._sanitize(realtime_stats, ['recognition_frequency'], ['avg_confidence'])
+            realtime_stats['avg_confidence'] = realtime_stats['avg_confidence'].round(3)
 
             # Sort by date (ascending)
             return realtime_stats.sort_values('date', ascending=True).reset_index()
@@ -434,12 +778,15 @@ class SparkAnalyticsEngine:
     def generate_comprehensive_report(self):
         """Generate comprehensive report"""
         print("📊 Generating comprehensive report...")
+        self._wait_for_spark()
         
         try:
             report = {
-                "peak_hours": self.analyze_peak_hours(),
-                "daily_patterns": self.analyze_daily_patterns(),
-                "employee_performance": self.analyze_employee_performance(),
+                "peak_hours": self.summarize_peak_hours(self.analyze_peak_hours()),
+                "daily_patterns": self.summarize_daily_patterns(self.analyze_daily_patterns()),
+                "employee_performance": self.summarize_employee_performance(
+                    self.analyze_employee_performance()
+                ),
                 "accuracy_trends": self.analyze_recognition_accuracy_trends(),
                 "real_time_insights": self.real_time_analytics_simulation()
             }
@@ -476,6 +823,7 @@ class SparkAnalyticsEngine:
     
     def close(self):
         """Close Spark session"""
+        self._wait_for_spark()
         if self.spark:
             try:
                 self.spark.stop()
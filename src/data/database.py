@@ -1,15 +1,22 @@
 # src/data/database.py
 from pymongo import MongoClient
 
+# One client (and connection pool) reused by every get_database() call
+_client = None
+
 def get_database():
     """
     Connect to MongoDB and return the database object
     """
+    global _client
+    
     # Connection string - update with your MongoDB details if needed
     connection_string = "mongodb://localhost:27017/"
     
-    # Create a connection using MongoClient
-    client = MongoClient(connection_string)
+    # Create the connection on first use
+    if _client is None:
+        _client = MongoClient(connection_string)
+    client = _client
     
     # Create or get the database
     db = client['face_recognition_db']
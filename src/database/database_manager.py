@@ -8,10 +8,16 @@ from pymongo import MongoClient
 from datetime import datetime
 import os
 import json
+import socket
+import threading
 
 class DatabaseManager:
     """Centralized database connection manager"""
     
+    # Give up on an unreachable server after 2 s instead of the driver's 30 s
+    # (no socket timeout - analytics reads can legitimately take longer)
+    SERVER_TIMEOUT_MS = 2000
+    
     def __init__(self, connection_string="mongodb://localhost:27017/", database_name="face_recognition_db"):
         self.connection_string = connection_string
         self.database_name = database_name
@@ -22,15 +28,47 @@ class DatabaseManager:
     def _connect(self):
         """Establish database connection"""
         try:
-            self.client = MongoClient(self.connection_string)
+            # Fail fast when nothing listens, instead of waiting out server selection
+            if not self._server_reachable():
+                raise ConnectionError(f"MongoDB server not reachable at {self.connection_string}")
+            
+            self.client = MongoClient(
+                self.connection_string,
+                serverSelectionTimeoutMS=self.SERVER_TIMEOUT_MS,
+                connectTimeoutMS=self.SERVER_TIMEOUT_MS
+            )
             self.db = self.client[self.database_name]
             # Test connection
-            self.client.admin.command('ismaster')
+            self.client.admin.command('ping')
             print(f"✅ Connected to MongoDB: {self.database_name}")
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
             raise
     
+    def _server_reachable(self, timeout=1.0):
+        """
+        Cheap TCP probe of the hosts in the connection string
+        
+        True if any host accepts a connection. mongodb+srv:// and unparsable
+        URIs are not probed (reported as reachable) and left to the driver -
+        resolving SRV records here would only repeat the driver's DNS lookup.
+        """
+        if self.connection_string.startswith("mongodb+srv://"):
+            return True
+        
+        try:
+            hosts = pymongo.uri_parser.parse_uri(self.connection_string, connect_timeout=timeout)['nodelist']
+        except Exception:
+            return True
+        
+        for host, port in hosts:
+            try:
+                with socket.create_connection((host, port), timeout=timeout):
+                    return True
+            except OSError:
+                continue
+        return not hosts
+    
     def get_collection(self, collection_name):
         """Get a collection from the database"""
         if self.db is None:
@@ -50,7 +88,7 @@ class DatabaseManager:
         """Test database connection"""
         try:
             if self.client is not None:
-                self.client.admin.command('ismaster')
+                self.client.admin.command('ping')
                 return True
             return False
         except Exception:
@@ -115,23 +153,27 @@ class DatabaseConfig:
                 'database_name': 'face_recognition_db'
             }
 
-# Singleton database manager instance
+# Singleton database manager instance (one MongoClient and connection pool
+# shared by every database class and thread)
 _db_manager = None
+_db_manager_lock = threading.Lock()
 
 def get_database_manager():
     """Get the global database manager instance"""
     global _db_manager
-    if _db_manager is None:
-        config = DatabaseConfig.load_from_config()
-        _db_manager = DatabaseManager(
-            connection_string=config['connection_string'],
-            database_name=config['database_name']
-        )
+    with _db_manager_lock:
+        if _db_manager is None:
+            config = DatabaseConfig.load_from_config()
+            _db_manager = DatabaseManager(
+                connection_string=config['connection_string'],
+                database_name=config['database_name']
+            )
     return _db_manager
 
 def close_database_manager():
     """Close the global database manager"""
     global _db_manager
-    if _db_manager is not None:
-        _db_manager.close()
-        _db_manager = None
\ No newline at end of file
+    with _db_manager_lock:
+        if _db_manager is not None:
+            _db_manager.close()
+            _db_manager = None
\ No newline at end of file
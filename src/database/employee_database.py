@@ -5,6 +5,7 @@ Handles employee CRUD operations and attendance tracking
 """
 import pymongo
 from datetime import datetime, time
+import re
 import uuid
 
 from .database_manager import get_database_manager
@@ -12,8 +13,13 @@ from .database_manager import get_database_manager
 class EmployeeDatabase:
     """Employee database operations"""
     
+    # Bumped on every employee write (shared by all instances), so cached
+    # listings stay valid until something changes
+    _generation = 0
+    
     def __init__(self):
         self.db_manager = get_database_manager()
+        self._employees_cache = {}
         
         # Get collections
         self.employees_collection = self.db_manager.get_collection("employees")
@@ -34,7 +40,9 @@ class EmployeeDatabase:
         attendance_indexes = [
             {"keys": [("employee_id", 1), ("date", 1)], "unique": True},
             {"keys": "date"},
-            {"keys": "enter_time"}
+            {"keys": "enter_time"},
+            # Today's attendance: equality on date, sorted by enter_time
+            {"keys": [("date", 1), ("enter_time", 1)]}
         ]
         
         face_indexes = [
@@ -63,6 +71,7 @@ class EmployeeDatabase:
         
         try:
             self.employees_collection.insert_one(employee_doc)
+            self._invalidate_cache()
             print(f"✅ Employee added: {name} (ID: {employee_id})")
             return employee_id
         except pymongo.errors.DuplicateKeyError as e:
@@ -79,10 +88,34 @@ class EmployeeDatabase:
         """Get employee by name (case insensitive)"""
         return self.employees_collection.find_one({"name": {"$regex": f"^{name}$", "$options": "i"}})
     
-    def list_employees(self, active_only=True):
-        """List all employees"""
+    def list_employees(self, active_only=True, fields=None, force=False):
+        """
+        List all employees (cached until the next employee write)
+        
+        Args:
+            active_only: Only list active employees
+            fields: Optional list of field names to return (all fields if None)
+            force: Query the database even if a cached listing exists - the
+                cache only sees writes made through this process
+        """
+        cache_key = (active_only, tuple(fields) if fields else None)
+        generation = EmployeeDatabase._generation
+        cached = self._employees_cache.get(cache_key)
+        if not force and cached is not None and cached[0] == generation:
+            return list(cached[1])
+        
         filter_query = {"is_active": True} if active_only else {}
-        return list(self.employees_collection.find(filter_query).sort("name", 1))
+        projection = None
+        if fields:
+            projection = {field: 1 for field in fields}
+            projection["_id"] = 0
+        employees = list(self.employees_collection.find(filter_query, projection).sort("name", 1))
+        self._employees_cache[cache_key] = (generation, employees)
+        return list(employees)
+    
+    def _invalidate_cache(self):
+        """Drop cached employee listings in every instance"""
+        EmployeeDatabase._generation += 1
     
     def link_face_to_employee(self, employee_id, face_name):
         """Link existing face samples to an employee"""
@@ -102,12 +135,13 @@ class EmployeeDatabase:
                 {"employee_id": employee_id},
                 {"$set": {"face_enrolled": True}}
             )
+            self._invalidate_cache()
         
         print(f"✅ Linked {result.modified_count} face samples to employee {employee_id}")
         return result.modified_count
     
     def record_attendance(self, employee_id, enter_time=None):
-        """Record employee attendance"""
+        """Record employee attendance, returning the attendance document (existing or new)"""
         if enter_time is None:
             enter_time = datetime.now()
         
@@ -126,7 +160,7 @@ class EmployeeDatabase:
         
         if existing:
             print(f"⚠️ Attendance already recorded for {employee['name']} today")
-            return existing["_id"]
+            return existing
         
         # Calculate if late
         work_start_str = employee.get("work_start_time", "09:00")
@@ -146,18 +180,28 @@ class EmployeeDatabase:
             "created_at": datetime.now()
         }
         
-        result = self.attendance_collection.insert_one(attendance_doc)
+        self.attendance_collection.insert_one(attendance_doc)
         
         # Log the attendance
         status = "LATE" if is_late else "ON TIME"
         print(f"📋 Attendance recorded: {employee['name']} - {status} at {enter_time.strftime('%H:%M:%S')}")
         
-        return result.inserted_id
+        # insert_one() filled in the document's _id
+        return attendance_doc
     
-    def get_today_attendance(self):
-        """Get today's attendance records"""
+    def get_today_attendance(self, fields=None):
+        """
+        Get today's attendance records, sorted by entry time
+        
+        Args:
+            fields: Optional list of field names to return (all fields if None)
+        """
         today = datetime.combine(datetime.now().date(), datetime.min.time())
-        return list(self.attendance_collection.find({"date": today}).sort("enter_time", 1))
+        projection = None
+        if fields:
+            projection = {field: 1 for field in fields}
+            projection["_id"] = 0
+        return list(self.attendance_collection.find({"date": today}, projection).sort("enter_time", 1))
     
     def get_employee_attendance_history(self, employee_id, days=30):
         """Get attendance history for an employee"""
@@ -182,6 +226,53 @@ class EmployeeDatabase:
         # Fallback: try to find employee with matching name
         return self.get_employee_by_name(face_name)
     
+    def find_employees_by_face_names(self, face_names):
+        """
+        Resolve many face names to employees in a fixed number of queries
+        
+        Same lookup as find_employee_by_face_name, batched with $in.
+        Returns a list of {"face_name", "employee_id"} dicts for the names
+        that map to an employee.
+        """
+        face_names = list(dict.fromkeys(face_names))
+        if not face_names:
+            return []
+        
+        # Face samples already linked to an employee (first sample wins)
+        linked = {}
+        for face_doc in self.faces_collection.find(
+            {"name": {"$in": face_names}, "employee_id": {"$exists": True}},
+            {"_id": 0, "name": 1, "employee_id": 1}
+        ):
+            linked.setdefault(face_doc["name"], face_doc["employee_id"])
+        
+        existing = {
+            emp["employee_id"] for emp in self.employees_collection.find(
+                {"employee_id": {"$in": list(set(linked.values()))}},
+                {"_id": 0, "employee_id": 1}
+            )
+        } if linked else set()
+        
+        # Fallback for unlinked names: employee with a matching name (case insensitive)
+        by_name = {}
+        unlinked = [name for name in face_names if name not in linked]
+        if unlinked:
+            patterns = [re.compile(f"^{re.escape(name)}$", re.IGNORECASE) for name in unlinked]
+            for emp in self.employees_collection.find(
+                {"name": {"$in": patterns}}, {"_id": 0, "name": 1, "employee_id": 1}
+            ):
+                by_name.setdefault(emp["name"].lower(), emp["employee_id"])
+        
+        results = []
+        for name in face_names:
+            if name in linked:
+                employee_id = linked[name] if linked[name] in existing else None
+            else:
+                employee_id = by_name.get(name.lower())
+            if employee_id is not None:
+                results.append({"face_name": name, "employee_id": employee_id})
+        return results
+    
     def close(self):
         """Close database connection"""
         # Database manager handles connection closure
@@ -6,14 +6,20 @@ Handles face encodings storage and recognition events
 import numpy as np
 from datetime import datetime
 import pickle
+from bson.binary import Binary
 
 from .database_manager import get_database_manager
 
 class FaceDatabase:
     """Face database operations"""
     
+    # Bumped on every face write (shared by all instances), so the cached
+    # face list stays valid until something changes
+    _generation = 0
+    
     def __init__(self):
         self.db_manager = get_database_manager()
+        self._faces_cache = None
         
         # Get collections
         self.faces_collection = self.db_manager.get_collection("faces")
@@ -37,11 +43,23 @@ class FaceDatabase:
         self.db_manager.create_indexes("faces", face_indexes)
         self.db_manager.create_indexes("recognition_events", event_indexes)
     
+    @staticmethod
+    def _encode(face_encoding):
+        """Pack a face encoding as float32 bytes for storage"""
+        return Binary(np.asarray(face_encoding, dtype=np.float32).tobytes())
+    
+    @staticmethod
+    def _decode(stored_encoding):
+        """Unpack a stored encoding (float32 bytes or legacy list) into float32"""
+        if isinstance(stored_encoding, bytes):
+            return np.frombuffer(stored_encoding, dtype=np.float32)
+        return np.asarray(stored_encoding, dtype=np.float32)
+    
     def add_face(self, name, face_encoding, additional_info=None):
         """Add a face to the database"""
         face_doc = {
             "name": name,
-            "encoding": face_encoding.tolist(),  # Convert numpy array to list
+            "encoding": self._encode(face_encoding),
             "created_at": datetime.now()
         }
         
@@ -50,18 +68,77 @@ class FaceDatabase:
             face_doc.update(additional_info)
         
         result = self.faces_collection.insert_one(face_doc)
+        self._invalidate_cache()
         return result.inserted_id
     
+    def add_faces_bulk(self, name, encodings_and_info):
+        """
+        Add several faces for one person in a single round-trip
+        
+        Args:
+            name: Person name shared by all samples
+            encodings_and_info: Iterable of (face_encoding, additional_info) pairs
+            
+        Returns:
+            list: Inserted document IDs, in input order
+        """
+        face_docs = []
+        created_at = datetime.now()
+        
+        for face_encoding, additional_info in encodings_and_info:
+            face_doc = {
+                "name": name,
+                "encoding": self._encode(face_encoding),
+                "created_at": created_at
+            }
+            if additional_info and isinstance(additional_info, dict):
+                face_doc.update(additional_info)
+            face_docs.append(face_doc)
+        
+        if not face_docs:
+            return []
+        
+        result = self.faces_collection.insert_many(face_docs, ordered=False)
+        self._invalidate_cache()
+        return result.inserted_ids
+    
     def get_all_faces(self):
-        """Get all faces from the database"""
+        """Get all faces from the database (cached until the next face write)"""
+        generation = FaceDatabase._generation
+        if self._faces_cache is not None and self._faces_cache[0] == generation:
+            return list(self._faces_cache[1])
+        
         faces = []
         
         for face_doc in self.faces_collection.find():
-            encoding = np.array(face_doc["encoding"])
+            encoding = self._decode(face_doc["encoding"])
             name = face_doc["name"]
             faces.append((name, encoding))
         
-        return faces
+        self._faces_cache = (generation, faces)
+        return list(faces)
+    
+    def _invalidate_cache(self):
+        """Drop the cached face list in every instance"""
+        FaceDatabase._generation += 1
+    
+    def count_faces_by_employee(self, employee_ids=None):
+        """
+        Number of face samples linked to each employee_id, in one aggregation
+        
+        Args:
+            employee_ids: Optional ids to restrict the count to (bounds the scan)
+        """
+        if employee_ids is None:
+            match = {"employee_id": {"$exists": True}}
+        else:
+            match = {"employee_id": {"$in": list(employee_ids)}}
+        
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": "$employee_id", "count": {"$sum": 1}}}
+        ]
+        return {doc["_id"]: doc["count"] for doc in self.faces_collection.aggregate(pipeline)}
     
     def get_faces_by_name(self, name):
         """Get all faces for a given name"""
@@ -69,7 +146,7 @@ class FaceDatabase:
         
         for face_doc in self.faces_collection.find({"name": name}):
             face_id = face_doc["_id"]
-            encoding = np.array(face_doc["encoding"])
+            encoding = self._decode(face_doc["encoding"])
             faces.append((face_id, encoding))
         
         return faces
@@ -143,6 +220,7 @@ class FaceDatabase:
             # Clear existing faces if replace is True
             if replace:
                 self.faces_collection.delete_many({})
+                self._invalidate_cache()
             
             # Import faces
             count = 0
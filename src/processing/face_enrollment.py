@@ -87,7 +87,7 @@ class FaceEnrollment:
                     current_time - last_sample_time > sample_delay):
                     
                     # Capture the sample
-                    enrolled_encodings.append(face_encodings[0])
+                    enrolled_encodings.append(np.asarray(face_encodings[0], dtype=np.float32))
                     sample_count += 1
                     last_sample_time = current_time
                     
@@ -117,16 +117,16 @@ class FaceEnrollment:
         # Save enrolled faces to database
         if enrolled_encodings:
             print(f"\n💾 Saving {len(enrolled_encodings)} samples to database...")
-            for i, encoding in enumerate(enrolled_encodings):
-                face_id = self.face_db.add_face(
-                    name=person_name,
-                    face_encoding=encoding,
-                    additional_info={
-                        "sample_number": i + 1,
-                        "total_samples": len(enrolled_encodings),
-                        "enrollment_session": datetime.now().isoformat()
-                    }
-                )
+            enrollment_session = datetime.now().isoformat()
+            face_ids = self.face_db.add_faces_bulk(person_name, [
+                (encoding, {
+                    "sample_number": i + 1,
+                    "total_samples": len(enrolled_encodings),
+                    "enrollment_session": enrollment_session
+                })
+                for i, encoding in enumerate(enrolled_encodings)
+            ])
+            for i, face_id in enumerate(face_ids):
                 print(f"   ✅ Saved sample {i + 1} with ID: {face_id}")
             
             print(f"🎉 Successfully enrolled {person_name} with {len(enrolled_encodings)} samples!")
@@ -137,13 +137,16 @@ class FaceEnrollment:
     
     def get_enrollment_stats(self):
         """Get enrollment statistics"""
-        face_count = self.face_db.faces_collection.count_documents({})
         event_count = self.face_db.events_collection.count_documents({})
         
-        # Get unique names
-        pipeline = [{"$group": {"_id": "$name"}}]
-        unique_people = list(self.face_db.faces_collection.aggregate(pipeline))
-        people_count = len(unique_people)
+        # Count samples and unique names server-side in one aggregation
+        pipeline = [{"$facet": {
+            "samples": [{"$count": "n"}],
+            "people": [{"$group": {"_id": "$name"}}, {"$count": "n"}]
+        }}]
+        facets = next(self.face_db.faces_collection.aggregate(pipeline), {})
+        face_count = facets["samples"][0]["n"] if facets.get("samples") else 0
+        people_count = facets["people"][0]["n"] if facets.get("people") else 0
         
         stats = {
             "total_face_samples": face_count,
@@ -16,6 +16,17 @@ class ImprovedFaceProcessor:
         self.face_cascade = cv2.CascadeClassifier(
             cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
         )
+        self._cascade_params = {'scaleFactor': 1.1, 'minNeighbors': 5, 'minSize': (50, 50)}
+        
+        # HOG face detection runs on a downscaled copy of frames at least
+        # min_detection_height tall; encodings still use full resolution
+        self.detection_scale = 0.5
+        self.min_detection_height = 240
+        
+        # Conversion buffers, allocated on first frame and reused while the shape holds
+        self._frame_shape = None
+        self._rgb_buf = None
+        self._gray_buf = None
         
         if self.use_face_recognition:
             print("🎯 Using face_recognition library for recognition")
@@ -30,17 +41,32 @@ class ImprovedFaceProcessor:
         except ImportError:
             return False
     
-    def recognize_faces(self, frame, known_encodings, known_names, threshold=0.6):
-        """Recognize faces in frame"""
+    def recognize_faces(self, frame, known_matrix, known_names, threshold=0.6, known_norms=None):
+        """
+        Recognize faces in frame
+        
+        Args:
+            frame: Video frame (BGR format from OpenCV)
+            known_matrix: (N, 128) float32 matrix of known face encodings
+                (a list of encodings is also accepted and converted)
+            known_names: Names matching the rows of known_matrix
+            threshold: Maximum distance for a match
+            known_norms: Precomputed L2 norms of known_matrix rows (optional)
+        """
+        # No copy when the caller already passes the float32 matrix
+        known_matrix = np.asarray(known_matrix, dtype=np.float32)
         face_locations, face_encodings = self.detect_and_encode_faces(frame)
         
         processed_frame = frame.copy()
         recognition_results = []
         
-        if self.use_face_recognition and known_encodings:
+        if self.use_face_recognition and len(known_matrix):
+            if known_norms is None:
+                known_norms = np.linalg.norm(known_matrix, axis=1)
+            
             # Use face_recognition for actual recognition
             recognition_results = self._process_recognition(
-                face_locations, face_encodings, known_encodings, known_names, threshold
+                face_locations, face_encodings, known_matrix, known_norms, known_names, threshold
             )
             self._draw_recognition_results(processed_frame, recognition_results)
         else:
@@ -57,23 +83,44 @@ class ImprovedFaceProcessor:
         else:
             return self._detect_with_opencv(frame)
     
+    def _ensure_buffers(self, frame):
+        """(Re)allocate conversion buffers when the frame shape changes"""
+        if self._frame_shape != frame.shape:
+            height, width = frame.shape[:2]
+            self._rgb_buf = np.empty((height, width, 3), dtype=np.uint8)
+            self._gray_buf = np.empty((height, width), dtype=np.uint8)
+            self._frame_shape = frame.shape
+    
     def _detect_with_face_recognition(self, frame):
         """Use face_recognition library for detection"""
         import face_recognition
         
         # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        self._ensure_buffers(frame)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
         
-        # Find face locations and encodings
-        face_locations = face_recognition.face_locations(rgb_frame, model="hog")
+        # Find face locations on a smaller copy (detection cost scales with pixels)
+        scale = self.detection_scale
+        if scale < 1.0 and frame.shape[0] >= self.min_detection_height:
+            small = cv2.resize(rgb_frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            height, width = frame.shape[:2]
+            face_locations = [
+                (int(top / scale), min(width, int(right / scale)), min(height, int(bottom / scale)), int(left / scale))
+                for top, right, bottom, left in face_recognition.face_locations(small, model="hog")
+            ]
+        else:
+            face_locations = face_recognition.face_locations(rgb_frame, model="hog")
+        
+        # Encodings from the full-resolution frame
         face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
         
         return face_locations, face_encodings
     
     def _detect_with_opencv(self, frame):
         """Use OpenCV for detection only"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(50, 50))
+        self._ensure_buffers(frame)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        faces = self.face_cascade.detectMultiScale(gray, **self._cascade_params)
         
         # Convert to face_recognition format: (top, right, bottom, left)
         face_locations = []
@@ -82,29 +129,48 @@ class ImprovedFaceProcessor:
         
         return face_locations, []  # No encodings available
     
-    def _process_recognition(self, face_locations, face_encodings, known_encodings, known_names, threshold):
-        """Process face recognition results"""
-        import face_recognition
+    def _face_distances(self, known_matrix, known_norms, face_encodings):
+        """Euclidean distances, one row per encoding, to every row of known_matrix"""
+        encodings = np.asarray(face_encodings, dtype=known_matrix.dtype).reshape(-1, known_matrix.shape[1])
         
+        # ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b, one matrix product for all faces
+        squared = (
+            (known_norms ** 2)[np.newaxis, :]
+            + np.einsum('ij,ij->i', encodings, encodings)[:, np.newaxis]
+            - 2.0 * (encodings @ known_matrix.T)
+        )
+        return np.sqrt(np.maximum(squared, 0.0))
+    
+    def _process_recognition(self, face_locations, face_encodings, known_matrix, known_norms, known_names, threshold):
+        """Process face recognition results"""
         recognition_results = []
+        if not len(face_encodings):
+            return recognition_results
         
-        for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-            matches = face_recognition.compare_faces(known_encodings, face_encoding, tolerance=threshold)
-            distances = face_recognition.face_distance(known_encodings, face_encoding)
-            
+        # Distances for every face in the frame at once, best match per face
+        distances = self._face_distances(known_matrix, known_norms, face_encodings)
+        best_indices = np.argmin(distances, axis=1)
+        best_distances = distances[np.arange(len(best_indices)), best_indices]
+        
+        for location, best_index, best_distance in zip(face_locations, best_indices, best_distances):
             name = "Unknown"
             confidence = 0.0
             
-            if len(distances) > 0:
-                best_match_index = np.argmin(distances)
-                if matches[best_match_index]:
-                    name = known_names[best_match_index]
-                    confidence = 1 - distances[best_match_index]
+            if best_distance <= threshold:
+                name = known_names[best_index]
+                confidence = 1 - float(best_distance)
             
-            recognition_results.append((name, confidence, (top, right, bottom, left)))
+            recognition_results.append((name, confidence, location))
         
         return recognition_results
     
+    def draw_results(self, frame, recognition_results):
+        """Draw previously computed results onto a frame"""
+        if self.use_face_recognition:
+            self._draw_recognition_results(frame, recognition_results)
+        else:
+            self._draw_detection_results(frame, [location for _, _, location in recognition_results])
+    
     def _draw_recognition_results(self, frame, recognition_results):
         """Draw recognition results on frame"""
         for name, confidence, (top, right, bottom, left) in recognition_results:
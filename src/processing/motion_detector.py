@@ -2,19 +2,52 @@
 import cv2
 import numpy as np
 
+def _odd_size(size):
+    """Nearest odd kernel size (1 means the kernel is a no-op)"""
+    return max(1, int(round(size)) | 1)
+
 class MotionDetector:
-    def __init__(self, threshold=25, min_area=500):
+    def __init__(self, threshold=25, min_area=500, work_height=150, use_opencl=False):
         """
         Initialize the motion detector using frame differencing
         
         Args:
             threshold: Threshold for detecting motion
             min_area: Minimum contour area to be considered as motion
+                (in full-resolution pixels)
+            work_height: Height of the downscaled image motion is computed on
+            use_opencl: Run the mask pipeline through OpenCL (T-API) when a
+                device is available - off by default, since on integrated
+                GPUs the upload/download can cost more than it saves
         """
         self.threshold = threshold
         self.min_area = min_area
+        self.work_height = work_height
+        # Full-resolution blur and dilate sizes (two 3x3 dilations = one 5x5),
+        # scaled to the working image like min_area
+        self.blur_size = 21
+        self.dilate_size = 5
+        self._kernel_scale = None
+        self._blur_ksize = None
+        self.dilate_kernel = None
+        self._kernel_area = None
         self.prev_frame = None
+        self._prev_shape = None
         self.motion_detected = False
+        self.motion_box = None
+        self.motion_boxes = []
+        
+        # Scratch buffers for the CPU path, reused while the working size holds
+        self._buf_size = None
+        self._small = None
+        self._gray = None
+        self._blur = None
+        self._diff = None
+        self._thresh = None
+        self._dilated = None
+        
+        # Opt-in GPU path through OpenCL (T-API)
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
     
     def detect(self, frame):
         """
@@ -25,55 +58,171 @@ class MotionDetector:
             
         Returns:
             motion_detected: True if motion is detected, False otherwise
-            processed_frame: Frame with motion highlighted
+            processed_frame: Frame with motion highlighted (the input frame
+                itself when nothing was drawn)
+        
+        After the call, ``motion_box`` holds the union (x0, y0, x1, y1) of all
+        motion regions in full-resolution pixels, or None without motion, and
+        ``motion_boxes`` the individual (x, y, w, h) regions.
         """
-        # Make a copy of the frame for drawing
+        # Work on a downscaled copy - motion does not need full resolution
+        scale = min(1.0, self.work_height / frame.shape[0])
+        if scale < 1.0:
+            work_size = (max(1, int(frame.shape[1] * scale)), self.work_height)
+        else:
+            work_size = (frame.shape[1], frame.shape[0])
+        
+        # Blob areas shrink with the square of the scale, kernels linearly
+        min_area = self.min_area * scale * scale
+        self._scale_kernels(scale)
+        
+        if self.use_opencl:
+            thresh = self._motion_mask_opencl(frame, work_size, min_area)
+        else:
+            thresh = self._motion_mask(frame, work_size, min_area)
+        
+        # Reset motion flag
+        self.motion_detected = False
+        self.motion_box = None
+        self.motion_boxes = []
+        
+        # First frame (or the frame size changed), or too few changed pixels
+        if thresh is None:
+            return False, frame
+        
+        # Label the motion blobs - areas and bounding boxes come out of one pass
+        _, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8)
+        
+        # Row 0 is the background; keep blobs of at least min_area pixels
+        stats = stats[1:]
+        boxes = stats[stats[:, cv2.CC_STAT_AREA] >= min_area, :4]
+        if len(boxes) == 0:
+            return False, frame
+        
+        # Motion detected - map the boxes back to full resolution
+        self.motion_detected = True
+        boxes = (boxes / scale).astype(np.int32)
+        x, y, w, h = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        
+        # Union of all motion regions
+        self.motion_box = (int(x.min()), int(y.min()), int((x + w).max()), int((y + h).max()))
+        self.motion_boxes = boxes.tolist()
+        
+        return self.motion_detected, self.draw_motion(frame)
+    
+    def draw_motion(self, frame):
+        """
+        Draw the regions from the last detect() call
+        
+        Returns a copy of the frame with the motion rectangles, or the frame
+        itself when there is nothing to draw - so callers that skip detection
+        on some frames can keep showing the last result.
+        """
+        if not self.motion_boxes:
+            return frame
+        
         output_frame = frame.copy()
+        for (bx, by, bw, bh) in self.motion_boxes:
+            cv2.rectangle(output_frame, (bx, by), (bx + bw, by + bh), (0, 255, 0), 2)
+        return output_frame
+    
+    def _motion_mask(self, frame, work_size, min_area):
+        """Binary, dilated motion mask on the CPU (None on the first frame or without motion)"""
+        self._ensure_buffers(work_size)
+        
+        if work_size != (frame.shape[1], frame.shape[0]):
+            small = cv2.resize(frame, work_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
         
         # Convert to grayscale and apply Gaussian blur
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        gray = cv2.GaussianBlur(self._gray, self._blur_ksize, 0, dst=self._blur)
         
-        # If first frame, save it and return
-        if self.prev_frame is None:
+        if self.prev_frame is None or self._prev_shape != work_size:
+            # Keep this frame as the reference and blur the next one elsewhere
             self.prev_frame = gray
-            return False, output_frame
+            self._prev_shape = work_size
+            self._blur = np.empty_like(gray)
+            return None
         
-        # Compute absolute difference between current and previous frame
-        frame_diff = cv2.absdiff(self.prev_frame, gray)
+        # Difference against the previous frame, thresholded to a binary mask
+        cv2.absdiff(self.prev_frame, gray, dst=self._diff)
+        cv2.threshold(self._diff, self.threshold, 255, cv2.THRESH_BINARY, dst=self._thresh)
+        changed = cv2.countNonZero(self._thresh)
         
-        # Apply threshold
-        thresh = cv2.threshold(frame_diff, self.threshold, 255, cv2.THRESH_BINARY)[1]
+        # Update previous frame - swap so the old one becomes the next blur target
+        self.prev_frame, self._blur = gray, self.prev_frame
         
-        # Dilate threshold image to fill in holes
-        thresh = cv2.dilate(thresh, None, iterations=2)
+        if not self._enough_changed(changed, min_area):
+            return None
         
-        # Find contours in the threshold image
-        contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Dilate threshold image to fill in holes (one pass with the scaled kernel)
+        return cv2.dilate(self._thresh, self.dilate_kernel, dst=self._dilated)
+    
+    def _scale_kernels(self, scale):
+        """Size the blur and dilate kernels for the working scale"""
+        if scale == self._kernel_scale:
+            return
         
-        # Reset motion flag
-        self.motion_detected = False
+        blur = _odd_size(self.blur_size * scale)
+        self._blur_ksize = (blur, blur)
+        dilate = _odd_size(self.dilate_size * scale)
+        self.dilate_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (dilate, dilate))
+        self._kernel_area = dilate * dilate
+        self._kernel_scale = scale
+    
+    def _ensure_buffers(self, work_size):
+        """(Re)allocate the CPU scratch buffers for the working size"""
+        if self._buf_size == work_size:
+            return
         
-        # Check each contour
-        for contour in contours:
-            if cv2.contourArea(contour) < self.min_area:
-                continue
-            
-            # Motion detected
-            self.motion_detected = True
-            
-            # Draw rectangle around contour
-            (x, y, w, h) = cv2.boundingRect(contour)
-            cv2.rectangle(output_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        width, height = work_size
+        self._small = np.empty((height, width, 3), np.uint8)
+        self._gray = np.empty((height, width), np.uint8)
+        self._blur = np.empty_like(self._gray)
+        self._diff = np.empty_like(self._gray)
+        self._thresh = np.empty_like(self._gray)
+        self._dilated = np.empty_like(self._gray)
+        self._buf_size = work_size
+    
+    def _enough_changed(self, changed, min_area):
+        """
+        Whether the changed pixels could form a blob of min_area
+        
+        detect() filters on the area of the dilated blobs, and dilation with
+        the (scaled) kernel grows each pixel to at most the kernel area -
+        below that bound the dilate and labeling steps cannot find anything
+        and are skipped.
+        """
+        return changed * self._kernel_area >= min_area
+    
+    def _motion_mask_opencl(self, frame, work_size, min_area):
+        """Same mask as _motion_mask, computed on the OpenCL device"""
+        # Buffers stay on the device across the chained calls
+        u_frame = cv2.UMat(frame)
+        if work_size != (frame.shape[1], frame.shape[0]):
+            u_frame = cv2.resize(u_frame, work_size, interpolation=cv2.INTER_AREA)
+        
+        gray = cv2.cvtColor(u_frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, self._blur_ksize, 0)
         
-        # Update previous frame
+        if self.prev_frame is None or self._prev_shape != work_size:
+            self.prev_frame = gray
+            self._prev_shape = work_size
+            return None
+        
+        frame_diff = cv2.absdiff(self.prev_frame, gray)
+        thresh = cv2.threshold(frame_diff, self.threshold, 255, cv2.THRESH_BINARY)[1]
         self.prev_frame = gray
         
-        # Draw motion status text
-        status = "" if self.motion_detected else ""
-        cv2.putText(output_frame, status, (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+        if not self._enough_changed(cv2.countNonZero(thresh), min_area):
+            return None
+        
+        thresh = cv2.dilate(thresh, self.dilate_kernel)
         
-        return self.motion_detected, output_frame
+        # Contour tracing runs on the host
+        return thresh.get()
 
 
 # Test function
@@ -5,22 +5,37 @@ Improved version with better error handling and camera testing
 """
 import cv2
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 class VideoStream:
     """Video stream handler for camera input"""
     
-    def __init__(self, source=0):
+    def __init__(self, source=0, drop_stale=True):
         """
         Initialize the video stream
         
         Args:
             source: Camera index or video file path (0 for default webcam)
+            drop_stale: Read the camera on a background thread and always
+                hand out the newest frame instead of buffered ones (live
+                camera sources only - a file would be read as fast as
+                possible and mostly skipped)
         """
         self.source = source
+        self.drop_stale = drop_stale
         self.cap = None
         self.width = 0
         self.height = 0
         self.fps = 0
+        
+        # Latest-frame capture thread state
+        self._latest = None
+        self._frame_seq = 0
+        self._read_seq = 0
+        self._frame_ready = threading.Condition()
+        self._thread = None
+        self._running = False
     
     def test_camera(self):
         """Test if camera is available and working"""
@@ -52,13 +67,18 @@ class VideoStream:
             raise ValueError(f"Camera test failed: {test_message}")
         
         # Initialize capture
-        self.cap = cv2.VideoCapture(self.source)
+        self.cap = self._open_capture()
         if not self.cap.isOpened():
             raise ValueError(f"Unable to open video source {self.source}")
         
         # Set buffer size to reduce latency
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
+        # Ask webcams for MJPG - compressed on the camera, far less USB bandwidth
+        # than raw YUYV (must be set before the resolution on some backends)
+        if isinstance(self.source, int):
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        
         # Set camera properties for better performance
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
@@ -77,8 +97,55 @@ class VideoStream:
             self.cap.release()
             raise ValueError("Cannot read initial frame from camera")
         
+        # Keep draining the camera so read() never sees a stale buffered frame
+        if self.drop_stale and isinstance(self.source, int):
+            self._running = True
+            self._thread = threading.Thread(target=self._update, daemon=True)
+            self._thread.start()
+        
         return self
     
+    def _open_capture(self):
+        """Open the source, with hardware-accelerated decoding for video files/streams"""
+        if not isinstance(self.source, int) and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            cap = cv2.VideoCapture(
+                self.source, cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            )
+            if cap.isOpened():
+                return cap
+            cap.release()
+        
+        return cv2.VideoCapture(self.source)
+    
+    def _update(self):
+        """
+        Capture thread - keep only the newest frame from the camera
+        
+        The thread owns the capture while it runs and releases it on exit,
+        so it is never released in the middle of a read().
+        """
+        cap = self.cap
+        try:
+            while self._running:
+                try:
+                    ret, frame = cap.read()
+                except Exception as e:
+                    print(f"Error reading frame: {e}")
+                    ret, frame = False, None
+                
+                if not ret or frame is None or frame.size == 0:
+                    time.sleep(0.01)
+                    continue
+                
+                with self._frame_ready:
+                    self._latest = frame
+                    self._frame_seq += 1
+                    self._frame_ready.notify_all()
+        finally:
+            cap.release()
+            print("📴 Camera released")
+    
     def read(self):
         """
         Read a frame from the video stream with timeout handling
@@ -90,6 +157,18 @@ class VideoStream:
         if self.cap is None:
             return False, None
         
+        if self._thread is not None:
+            # Wait for a frame newer than the last one handed out
+            with self._frame_ready:
+                self._frame_ready.wait_for(
+                    lambda: self._frame_seq != self._read_seq or not self._running,
+                    timeout=0.5
+                )
+                if self._frame_seq == self._read_seq:
+                    return False, None
+                self._read_seq = self._frame_seq
+                return True, self._latest
+        
         try:
             ret, frame = self.cap.read()
             
@@ -105,7 +184,16 @@ class VideoStream:
     
     def stop(self):
         """Release the video stream"""
-        if self.cap is not None:
+        if self._thread is not None:
+            # The capture thread releases the camera once its current read returns
+            self._running = False
+            with self._frame_ready:
+                self._frame_ready.notify_all()
+            self._thread.join(timeout=1.0)
+            if self._thread.is_alive():
+                print("⚠️ Camera read still in progress - released when it returns")
+            self._thread = None
+        elif self.cap is not None:
             self.cap.release()
             print("📴 Camera released")
         self.cap = None
@@ -128,22 +216,27 @@ class VideoStream:
         return self.cap is not None and self.cap.isOpened()
     
     @staticmethod
-    def list_available_cameras():
-        """List all available camera indices"""
-        available_cameras = []
-        
-        for i in range(10):  # Check first 10 camera indices
-            cap = cv2.VideoCapture(i)
+    def _probe_camera(index):
+        """Open one camera index and report its resolution, or None if unusable"""
+        cap = cv2.VideoCapture(index)
+        try:
             if cap.isOpened():
                 ret, frame = cap.read()
                 if ret and frame is not None and frame.size > 0:
-                    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    available_cameras.append({
-                        'index': i,
-                        'width': width,
-                        'height': height
-                    })
+                    return {
+                        'index': index,
+                        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                    }
+            return None
+        finally:
             cap.release()
+    
+    @staticmethod
+    def list_available_cameras():
+        """List all available camera indices"""
+        # Opening a device blocks on the driver, so probe the first 10 indices in parallel
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(VideoStream._probe_camera, range(10)))
         
-        return available_cameras
\ No newline at end of file
+        return [camera for camera in results if camera is not None]
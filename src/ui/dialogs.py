@@ -6,6 +6,53 @@ Handles employee addition, face enrollment, and other modal interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import queue
+
+# Database calls run on one worker thread (serialized) so dialogs never block Tk
+_db_tasks = queue.Queue()
+_db_worker = None
+_db_worker_lock = threading.Lock()
+
+def _db_worker_loop():
+    """Run queued database tasks one at a time"""
+    while True:
+        task, on_success, on_error = _db_tasks.get()
+        try:
+            result = task()
+        except Exception as e:
+            on_error(e)
+        else:
+            on_success(result)
+
+def run_db_task(widget, task, on_success=None, on_error=None):
+    """
+    Run a database call off the UI thread
+    
+    Args:
+        widget: Tk widget whose event loop receives the callbacks
+        task: Callable doing the database work
+        on_success: Called with the task result on the Tk main thread
+        on_error: Called with the exception on the Tk main thread
+    """
+    global _db_worker
+    with _db_worker_lock:
+        if _db_worker is None:
+            _db_worker = threading.Thread(target=_db_worker_loop, daemon=True)
+            _db_worker.start()
+    
+    def post(callback, value):
+        if callback is None:
+            return
+        try:
+            widget.after(0, lambda: callback(value))
+        except (tk.TclError, RuntimeError):
+            pass  # Widget was closed while the task was running
+    
+    _db_tasks.put((
+        task,
+        lambda result: post(on_success, result),
+        lambda error: post(on_error, error)
+    ))
 
 class EmployeeDialog:
     """Dialog for adding new employees"""
@@ -61,7 +108,8 @@ class EmployeeDialog:
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=5, column=0, columnspan=2, pady=20)
         
-        ttk.Button(button_frame, text="Add Employee", command=self.add_employee).pack(side=tk.LEFT, padx=5)
+        self.add_button = ttk.Button(button_frame, text="Add Employee", command=self.add_employee)
+        self.add_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.LEFT, padx=5)
         
         # Focus on name entry
@@ -74,20 +122,25 @@ class EmployeeDialog:
             messagebox.showerror("Error", "Name is required!")
             return
         
-        try:
-            employee_id = self.emp_db.add_employee(
-                name=name,
-                phone=self.phone_entry.get().strip() or None,
-                department=self.dept_entry.get().strip() or None,
-                position=self.pos_entry.get().strip() or None,
-                work_start_time=self.time_entry.get().strip() or "09:00"
-            )
-            
+        employee = {
+            'name': name,
+            'phone': self.phone_entry.get().strip() or None,
+            'department': self.dept_entry.get().strip() or None,
+            'position': self.pos_entry.get().strip() or None,
+            'work_start_time': self.time_entry.get().strip() or "09:00"
+        }
+        
+        def added(employee_id):
             self.result = employee_id
             self.dialog.destroy()
-            
-        except Exception as e:
+        
+        def failed(e):
+            self.add_button.config(state=tk.NORMAL)
             messagebox.showerror("Error", f"Failed to add employee: {e}")
+        
+        # Prevent double submission while the insert is running
+        self.add_button.config(state=tk.DISABLED)
+        run_db_task(self.dialog, lambda: self.emp_db.add_employee(**employee), added, failed)
     
     def cancel(self):
         """Cancel dialog"""
@@ -95,7 +148,14 @@ class EmployeeDialog:
 
 def show_manual_attendance_dialog(parent, emp_db, refresh_callback):
     """Show manual attendance recording dialog"""
-    employees = emp_db.list_employees()
+    run_db_task(
+        parent, lambda: emp_db.list_employees(fields=["name", "employee_id"]),
+        lambda employees: _build_manual_attendance_dialog(parent, emp_db, employees, refresh_callback),
+        lambda e: messagebox.showerror("Error", f"Failed to load employees: {e}")
+    )
+
+def _build_manual_attendance_dialog(parent, emp_db, employees, refresh_callback):
+    """Create the manual attendance dialog for the loaded employees"""
     if not employees:
         messagebox.showwarning("Warning", "No employees found. Add employees first.")
         return
@@ -113,8 +173,8 @@ def show_manual_attendance_dialog(parent, emp_db, refresh_callback):
     emp_listbox = tk.Listbox(dialog, height=15)
     emp_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
     
-    for emp in employees:
-        emp_listbox.insert(tk.END, f"{emp['name']} ({emp['employee_id']})")
+    # One insert call for all rows
+    emp_listbox.insert(tk.END, *[f"{emp['name']} ({emp['employee_id']})" for emp in employees])
     
     def record_selected():
         selection = emp_listbox.curselection()
@@ -123,15 +183,21 @@ def show_manual_attendance_dialog(parent, emp_db, refresh_callback):
             return
         
         selected_emp = employees[selection[0]]
-        try:
-            emp_db.record_attendance(selected_emp['employee_id'])
+        
+        def recorded(_):
             messagebox.showinfo("Success", f"Attendance recorded for {selected_emp['name']}")
             dialog.destroy()
             refresh_callback()
-        except Exception as e:
+        
+        def failed(e):
+            record_button.config(state=tk.NORMAL)
             messagebox.showerror("Error", f"Failed to record attendance: {e}")
+        
+        record_button.config(state=tk.DISABLED)
+        run_db_task(dialog, lambda: emp_db.record_attendance(selected_emp['employee_id']), recorded, failed)
     
-    ttk.Button(dialog, text="Record Attendance", command=record_selected).pack(pady=10)
+    record_button = ttk.Button(dialog, text="Record Attendance", command=record_selected)
+    record_button.pack(pady=10)
     ttk.Button(dialog, text="Cancel", command=dialog.destroy).pack()
 
 def show_face_enrollment_dialog(parent, employee, face_db, reload_callback):
@@ -192,15 +258,24 @@ def run_face_enrollment_thread(parent, employee, face_db, reload_callback):
 
 def show_face_link_dialog(parent, emp_db, face_db, reload_callback):
     """Show dialog to manually link existing face to employee"""
-    employees = emp_db.list_employees()
+    def load():
+        # Get employees and available face names
+        employees = emp_db.list_employees(fields=["name", "employee_id"])
+        all_faces = face_db.get_all_faces()
+        return employees, list(dict.fromkeys(face[0] for face in all_faces))
+    
+    run_db_task(
+        parent, load,
+        lambda data: _build_face_link_dialog(parent, emp_db, data[0], data[1], reload_callback),
+        lambda e: messagebox.showerror("Error", f"Failed to load face data: {e}")
+    )
+
+def _build_face_link_dialog(parent, emp_db, employees, face_names, reload_callback):
+    """Create the face linking dialog for the loaded employees and face names"""
     if not employees:
         messagebox.showwarning("Warning", "No employees found.")
         return
     
-    # Get available face names
-    all_faces = face_db.get_all_faces()
-    face_names = list(set([face[0] for face in all_faces]))
-    
     if not face_names:
         messagebox.showwarning("Warning", "No face data found.")
         return
@@ -233,14 +308,22 @@ def show_face_link_dialog(parent, emp_db, face_db, reload_callback):
         selected_emp = employees[emp_index]
         selected_face = face_var.get()
         
-        try:
-            linked_count = emp_db.link_face_to_employee(selected_emp['employee_id'], selected_face)
+        def linked(linked_count):
             messagebox.showinfo("Success", 
                 f"Linked {linked_count} face samples: {selected_face} → {selected_emp['name']}")
             dialog.destroy()
             reload_callback()
-        except Exception as e:
+        
+        def failed(e):
+            link_button.config(state=tk.NORMAL)
             messagebox.showerror("Error", f"Failed to link face: {e}")
+        
+        link_button.config(state=tk.DISABLED)
+        run_db_task(
+            dialog, lambda: emp_db.link_face_to_employee(selected_emp['employee_id'], selected_face),
+            linked, failed
+        )
     
-    ttk.Button(dialog, text="Link Face", command=link_face).pack(pady=20)
+    link_button = ttk.Button(dialog, text="Link Face", command=link_face)
+    link_button.pack(pady=20)
     ttk.Button(dialog, text="Cancel", command=dialog.destroy).pack()
\ No newline at end of file
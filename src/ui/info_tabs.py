@@ -2,18 +2,35 @@
 """
 Enhanced Information tabs with improved error handling and data formatting
 """
+import io
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import threading
+import queue
+import time
+import numpy as np
+import pandas as pd
+from .dialogs import run_db_task
 
 class InfoTabs:
     """Enhanced Information display tabs"""
     
+    # Seconds a refresh result is reused before MongoDB is queried again
+    EMPLOYEE_CACHE_TTL = 10
+    ATTENDANCE_CACHE_TTL = 10
+    
     def __init__(self, parent, main_window):
         self.parent = parent
         self.main_window = main_window
         
+        # Content currently shown in each read-only Text widget and Listbox
+        self._shown_text = {}
+        
+        # Query results keyed by name -> (load time, value), see _refresh_cached
+        self._cache = {}
+        
         # Create notebook
         self.notebook = ttk.Notebook(parent)
         
@@ -24,19 +41,57 @@ class InfoTabs:
         self.create_analytics_tab()
     
     def create_analytics_tab(self):
-        """Create Data Analytics tab with improved error handling"""
-        analytics_frame = ttk.Frame(self.notebook)
-        self.notebook.add(analytics_frame, text="Data Analytics")
+        """Create Data Analytics tab - its widgets are built when first shown"""
+        self._analytics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self._analytics_frame, text="Data Analytics")
+        self._analytics_built = False
+        self.notebook.bind("<<NotebookTabChanged>>", self._maybe_build_analytics, add="+")
+        
+        # Analytics data storage
+        self.analytics_data = {}
+        self.analytics_engine = None
+        
+        # Status messages from worker threads, applied by _drain_status while
+        # an analytics run is in progress (no polling when idle)
+        self._status_queue = queue.Queue()
+        self._status_polling = False
+        self._analytics_running = False
+        
+        # Per-key data versions, bumped only when a new report changes that key
+        self._data_versions = {}
         
+        # Rendered section text, keyed by section -> (data version, text)
+        self._rendered_sections = {}
+    
+    def _maybe_build_analytics(self, event=None):
+        """Build the analytics widgets the first time their tab is selected"""
+        if self._analytics_built or self.notebook.select() != str(self._analytics_frame):
+            return
+        
+        self._analytics_built = True
+        self.build_analytics_tab(self._analytics_frame)
+    
+    def build_analytics_tab(self, analytics_frame):
+        """Create Data Analytics widgets with improved error handling"""
         # Create scrollable frame
         canvas = tk.Canvas(analytics_frame)
         scrollbar = ttk.Scrollbar(analytics_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Bursts of <Configure> events (e.g. all sections rewritten) collapse
+        # into one scrollregion update
+        self._scroll_job = None
+        
+        def update_scrollregion():
+            self._scroll_job = None
+            canvas.configure(scrollregion=canvas.bbox("all"))
+        
+        def on_configure(event):
+            if self._scroll_job is not None:
+                canvas.after_cancel(self._scroll_job)
+            self._scroll_job = canvas.after(50, update_scrollregion)
+        
+        scrollable_frame.bind("<Configure>", on_configure)
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
@@ -56,8 +111,9 @@ class InfoTabs:
                                          command=self.run_analytics)
         self.analytics_button.pack(side=tk.LEFT, padx=2)
         
-        ttk.Button(btn_frame, text="Generate Report", 
-                  command=self.generate_full_report).pack(side=tk.LEFT, padx=2)
+        self.report_button = ttk.Button(btn_frame, text="Generate Report", 
+                                      command=self.generate_full_report)
+        self.report_button.pack(side=tk.LEFT, padx=2)
         
         ttk.Button(btn_frame, text="Refresh", 
                   command=self.refresh_analytics_display).pack(side=tk.LEFT, padx=2)
@@ -74,10 +130,6 @@ class InfoTabs:
         # Pack canvas and scrollbar
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
-        
-        # Analytics data storage
-        self.analytics_data = {}
-        self.analytics_engine = None
     
     def create_analytics_display_area(self, parent):
         """Create display areas for analytics results"""
@@ -86,28 +138,32 @@ class InfoTabs:
         metrics_frame = ttk.LabelFrame(parent, text="Data Processing Performance")
         metrics_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        self.metrics_text = tk.Text(metrics_frame, height=8, wrap=tk.WORD, font=("Courier", 9))
+        self.metrics_text = tk.Text(metrics_frame, height=8, wrap=tk.WORD, font=("Courier", 9),
+                                    undo=False, state=tk.DISABLED)
         self.metrics_text.pack(fill=tk.X, padx=5, pady=5)
         
         # Peak Hours Analysis
         peak_frame = ttk.LabelFrame(parent, text="Peak Hours Analysis")
         peak_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        self.peak_hours_text = tk.Text(peak_frame, height=10, wrap=tk.WORD, font=("Courier", 9))
+        self.peak_hours_text = tk.Text(peak_frame, height=10, wrap=tk.WORD, font=("Courier", 9),
+                                       undo=False, state=tk.DISABLED)
         self.peak_hours_text.pack(fill=tk.X, padx=5, pady=5)
         
         # Daily Patterns Analysis
         daily_frame = ttk.LabelFrame(parent, text="Daily Attendance Patterns")
         daily_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        self.daily_patterns_text = tk.Text(daily_frame, height=10, wrap=tk.WORD, font=("Courier", 9))
+        self.daily_patterns_text = tk.Text(daily_frame, height=10, wrap=tk.WORD, font=("Courier", 9),
+                                           undo=False, state=tk.DISABLED)
         self.daily_patterns_text.pack(fill=tk.X, padx=5, pady=5)
         
         # Employee Performance Analysis
         employee_frame = ttk.LabelFrame(parent, text="Employee Performance Analytics")
         employee_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        self.employee_performance_text = tk.Text(employee_frame, height=10, wrap=tk.WORD, font=("Courier", 9))
+        self.employee_performance_text = tk.Text(employee_frame, height=10, wrap=tk.WORD, font=("Courier", 9),
+                                                 undo=False, state=tk.DISABLED)
         self.employee_performance_text.pack(fill=tk.X, padx=5, pady=5)
     
     def run_analytics(self):
@@ -118,20 +174,39 @@ class InfoTabs:
                 
                 # Try to import analytics engine
                 try:
-                    from ..analytics.spark_analytics import SparkAnalyticsEngine
-                    self.analytics_engine = SparkAnalyticsEngine()
+                    from ..analytics.spark_analytics import (
+                        SparkAnalyticsEngine, get_data_version, load_cached_report, save_cached_report
+                    )
                     
-                    self.update_status("Loading data from MongoDB and processing...")
-                    self.analytics_engine.load_data_from_mongodb()
+                    # Reuse the last report while the source collections are unchanged
+                    # (checked on every run - see get_data_version)
+                    data_version = get_data_version()
+                    cached_report = load_cached_report(data_version)
+                    
+                    if cached_report is not None:
+                        self.update_status("Data unchanged - loading cached analytics results...")
+                        self._update_analytics_data(cached_report)
+                    else:
+                        # The engine (Spark session and loaded data) is kept between runs
+                        if self.analytics_engine is None:
+                            self.analytics_engine = SparkAnalyticsEngine()
+                        
+                        self.update_status("Loading data from MongoDB and processing...")
+                        self.analytics_engine.load_data_from_mongodb(data_version)
 
-                    self.update_status("Running comprehensive analytics algorithms...")
+                        self.update_status("Running comprehensive analytics algorithms...")
 
-                    # Run comprehensive analytics
-                    self.analytics_data = self.analytics_engine.generate_comprehensive_report()
+                        # Run comprehensive analytics
+                        self._update_analytics_data(self.analytics_engine.generate_comprehensive_report())
+                        
+                        # Demo-data reports are not cached, so real data replaces them
+                        # as soon as it arrives
+                        if "error" not in self.analytics_data and not self.analytics_engine.using_sample_data:
+                            save_cached_report(data_version, self.analytics_data)
                     
                     if "error" in self.analytics_data:
                         error_msg = f"Analytics completed with warnings: {self.analytics_data['error']}"
-                        self.main_window.root.after(0, lambda: self.update_status(error_msg))
+                        self.update_status(error_msg)
                     else:
                         self.update_status("Advanced analytics processing complete!")
                     
@@ -140,19 +215,23 @@ class InfoTabs:
                     
                 except ImportError as e:
                     error_msg = f"Analytics module not available: {str(e)}"
-                    self.main_window.root.after(0, lambda: self.update_status(error_msg))
+                    self.update_status(error_msg)
                     
                 except Exception as e:
                     error_msg = f"Analytics processing error (using fallback): {str(e)[:100]}"
-                    self.main_window.root.after(0, lambda: self.update_status(error_msg))
+                    self.update_status(error_msg)
                     print(f"Analytics error: {e}")
                 
             except Exception as e:
                 error_msg = f"Failed to run analytics: {str(e)[:100]}"
-                self.main_window.root.after(0, lambda: self.update_status(error_msg))
+                self.update_status(error_msg)
+            
+            finally:
+                self._analytics_running = False
         
         # Disable button during processing
         self.analytics_button.config(state=tk.DISABLED, text="Processing...")
+        self._start_status_updates()
         
         # Run in background thread
         threading.Thread(target=analytics_worker, daemon=True).start()
@@ -164,16 +243,15 @@ class InfoTabs:
                 self.update_status("No analytics data available")
                 return
             
-            # Display all sections with error handling
-            self.display_performance_metrics()
-            self.display_peak_hours_analysis()
-            self.display_daily_patterns()
-            self.display_employee_performance()
-            
-            # Re-enable button
-            self.analytics_button.config(state=tk.NORMAL, text="Run Analytics")
-
-            self.update_status("Analytics results ready! Advanced data processing complete.")
+            # Display all sections with error handling (text is cached per result);
+            # queued for the next idle pass so Tk lays the tab out once
+            root = self.main_window.root
+            for display in (self.display_performance_metrics,
+                            self.display_peak_hours_analysis,
+                            self.display_daily_patterns,
+                            self.display_employee_performance):
+                root.after_idle(display)
+            root.after_idle(self._analytics_display_done)
 
         except Exception as e:
             error_msg = f"Display error: {str(e)}"
@@ -181,6 +259,80 @@ class InfoTabs:
             self.analytics_button.config(state=tk.NORMAL, text="Run Analytics")
             print(f"Display error: {e}")
     
+    def _analytics_display_done(self):
+        """Re-enable analytics controls once all sections are shown"""
+        self.analytics_button.config(state=tk.NORMAL, text="Run Analytics")
+
+        self.update_status("Analytics results ready! Advanced data processing complete.")
+    
+    def display_performance_metrics(self):
+        """Display performance metrics"""
+        self._write_section('metrics', self.metrics_text, 'performance_metrics',
+                            self._render_performance_metrics)
+    
+    def display_peak_hours_analysis(self):
+        """Display peak hours analysis"""
+        self._write_section('peak', self.peak_hours_text, 'peak_hours',
+                            self._render_peak_hours)
+    
+    def display_daily_patterns(self):
+        """Display daily patterns"""
+        self._write_section('daily', self.daily_patterns_text, 'daily_patterns',
+                            self._render_daily_patterns)
+    
+    def display_employee_performance(self):
+        """Display employee performance"""
+        self._write_section('employee', self.employee_performance_text, 'employee_performance',
+                            self._render_employee_performance)
+    
+    def _update_analytics_data(self, report):
+        """Swap in a new report, bumping the version of each key whose data changed"""
+        previous = self.analytics_data
+        for key, data in report.items():
+            if key in previous and self._same_data(previous[key], data):
+                continue
+            self._data_versions[key] = self._data_versions.get(key, 0) + 1
+        
+        self.analytics_data = report
+    
+    @classmethod
+    def _same_data(cls, old, new):
+        """Whether two report values (DataFrames, dicts of them or scalars) are equal"""
+        if type(old) is not type(new):
+            return False
+        if isinstance(old, dict):
+            return old.keys() == new.keys() and all(cls._same_data(old[k], new[k]) for k in old)
+        if hasattr(old, 'equals'):
+            return old.equals(new)
+        try:
+            return bool(old == new)
+        except (TypeError, ValueError):
+            return False
+    
+    def _write_section(self, section, widget, data_key, renderer):
+        """Write a section's text, rendering it only when its data version changed"""
+        if data_key not in self.analytics_data:
+            return
+        
+        version = self._data_versions.get(data_key)
+        cached = self._rendered_sections.get(section)
+        if cached is not None and cached[0] == version:
+            return
+        
+        cached = (version, renderer(self.analytics_data[data_key]))
+        self._rendered_sections[section] = cached
+        self._set_text(widget, cached[1])
+    
+    def _set_text(self, widget, text):
+        """Replace a read-only Text widget's content, skipping unchanged text"""
+        if self._shown_text.get(str(widget)) == text:
+            return
+        
+        widget.configure(state=tk.NORMAL)
+        widget.replace(1.0, tk.END, text)
+        widget.configure(state=tk.DISABLED)
+        self._shown_text[str(widget)] = text
+    
     def safe_format_number(self, value, format_type="int"):
         """Safely format numbers to avoid type errors"""
         try:
@@ -198,14 +350,31 @@ class InfoTabs:
         except (ValueError, TypeError):
             return "N/A"
     
-    def display_performance_metrics(self):
-        """Display performance metrics with safe formatting"""
+    # Format specs matching safe_format_number, for whole numeric columns
+    COLUMN_FORMATS = {"int": "{:,.0f}", "float": "{:.3f}", "percent": "{:.1f}%"}
+    
+    def _format_column(self, column, format_type):
+        """Format a whole DataFrame column the way safe_format_number formats one value"""
+        spec = self.COLUMN_FORMATS.get(format_type)
+        if spec is None or not pd.api.types.is_numeric_dtype(column):
+            return column.map(lambda value: self.safe_format_number(value, format_type))
+        
+        # One float array and a builtin format per cell - no Python frame per value
+        values = column.to_numpy(dtype=float)
+        if format_type != "int":
+            return list(map(spec.format, values))
+        
+        # int(float(value)) truncates; + 0.0 turns -0.0 into 0.0
+        finite = np.isfinite(values)
+        formatted = list(map(spec.format, np.trunc(np.where(finite, values, 0.0)) + 0.0))
+        if not finite.all():
+            for i in np.flatnonzero(~finite):
+                formatted[i] = "N/A"
+        return formatted
+    
+    def _render_performance_metrics(self, metrics):
+        """Render performance metrics text with safe formatting"""
         try:
-            if 'performance_metrics' not in self.analytics_data:
-                return
-            
-            metrics = self.analytics_data['performance_metrics']
-            
             # Safe access to metrics with defaults
             events_processed = self.safe_format_number(metrics.get('total_events_processed', 0), "int")
             attendance_records = self.safe_format_number(metrics.get('total_attendance_records', 0), "int")
@@ -227,37 +396,25 @@ Processing Engine:
    • Processing Mode: Advanced Analytics
 """
             
-            self.metrics_text.delete(1.0, tk.END)
-            self.metrics_text.insert(tk.END, metrics_text)
+            return metrics_text
             
         except Exception as e:
-            self.metrics_text.delete(1.0, tk.END)
-            self.metrics_text.insert(tk.END, f"Error displaying performance metrics: {e}")
+            return f"Error displaying performance metrics: {e}"
     
-    def display_peak_hours_analysis(self):
-        """Display peak hours analysis with safe formatting"""
+    def _render_peak_hours(self, peak_summary):
+        """Render peak hours analysis text from the engine's precomputed summary"""
         try:
-            if 'peak_hours' not in self.analytics_data:
-                return
-            
-            peak_data = self.analytics_data['peak_hours']
-            
-            if peak_data.empty:
-                self.peak_hours_text.delete(1.0, tk.END)
-                self.peak_hours_text.insert(tk.END, "No peak hours data available")
-                return
-            
-            # Find peak hour safely
-            peak_hour_idx = peak_data['recognition_count'].idxmax()
-            peak_hour = peak_data.iloc[peak_hour_idx]
+            if not peak_summary or peak_summary['hours'].empty:
+                return "No peak hours data available"
             
             # Safe formatting
-            peak_hour_time = self.safe_format_number(peak_hour['hour'], "int")
-            peak_count = self.safe_format_number(peak_hour['recognition_count'], "int")
-            peak_confidence = self.safe_format_number(peak_hour['avg_confidence'], "float")
-            peak_people = self.safe_format_number(peak_hour['unique_people'], "int")
+            peak_hour_time = self.safe_format_number(peak_summary['peak_hour'], "int")
+            peak_count = self.safe_format_number(peak_summary['peak_count'], "int")
+            peak_confidence = self.safe_format_number(peak_summary['peak_confidence'], "float")
+            peak_people = self.safe_format_number(peak_summary['peak_people'], "int")
             
-            analysis_text = f"""
+            analysis_text = io.StringIO()
+            analysis_text.write(f"""
 📈 PEAK HOURS ANALYSIS
 
 Busiest Hour: {peak_hour_time}:00
@@ -266,71 +423,60 @@ Busiest Hour: {peak_hour_time}:00
    • Unique People: {peak_people}
 
 Hourly Breakdown (Top Hours):
-"""
+""")
             
             # Add top hours safely
             try:
-                top_hours = peak_data.nlargest(min(10, len(peak_data)), 'recognition_count')
-                for _, row in top_hours.iterrows():
-                    hour = self.safe_format_number(row['hour'], "int")
-                    count = self.safe_format_number(row['recognition_count'], "int")
-                    conf = self.safe_format_number(row['avg_confidence'], "float")
-                    analysis_text += f"   {hour}:00 - {count} recognitions (conf: {conf})\n"
+                top_hours = peak_summary['top10']
+                lines = [
+                    f"   {hour}:00 - {count} recognitions (conf: {conf})\n"
+                    for hour, count, conf in zip(
+                        self._format_column(top_hours['hour'], "int"),
+                        self._format_column(top_hours['recognition_count'], "int"),
+                        self._format_column(top_hours['avg_confidence'], "float")
+                    )
+                ]
+                analysis_text.writelines(lines)
             except Exception as e:
-                analysis_text += f"   Error processing hourly data: {e}\n"
+                analysis_text.write(f"   Error processing hourly data: {e}\n")
             
             # Summary stats
             try:
-                total_recognitions = self.safe_format_number(peak_data['recognition_count'].sum(), "int")
-                avg_confidence = self.safe_format_number(peak_data['avg_confidence'].mean(), "float")
+                total_recognitions = self.safe_format_number(peak_summary['total_recognitions'], "int")
+                avg_confidence = self.safe_format_number(peak_summary['avg_confidence'], "float")
                 
-                analysis_text += f"""
+                analysis_text.write(f"""
 Insights:
    • Total recognitions processed: {total_recognitions}
    • Overall average confidence: {avg_confidence}
    • Advanced pattern recognition applied
    • Peak activity identified and analyzed
-"""
+""")
             except Exception as e:
-                analysis_text += f"\nInsights: Error processing summary - {e}"
+                analysis_text.write(f"\nInsights: Error processing summary - {e}")
             
-            self.peak_hours_text.delete(1.0, tk.END)
-            self.peak_hours_text.insert(tk.END, analysis_text)
+            return analysis_text.getvalue()
             
         except Exception as e:
-            self.peak_hours_text.delete(1.0, tk.END)
-            self.peak_hours_text.insert(tk.END, f"Error displaying peak hours analysis: {e}")
+            return f"Error displaying peak hours analysis: {e}"
     
-    def display_daily_patterns(self):
-        """Display daily patterns with safe formatting"""
+    def _render_daily_patterns(self, daily_summary):
+        """Render daily patterns text from the engine's precomputed summary"""
         try:
-            if 'daily_patterns' not in self.analytics_data:
-                return
-            
-            daily_data = self.analytics_data['daily_patterns']
-            
-            if daily_data.empty:
-                self.daily_patterns_text.delete(1.0, tk.END)
-                self.daily_patterns_text.insert(tk.END, "No daily patterns data available")
-                return
-            
-            # Find patterns safely
-            busiest_day_idx = daily_data['total_attendance'].idxmax()
-            busiest_day = daily_data.iloc[busiest_day_idx]
-            
-            highest_late_idx = daily_data['late_percentage'].idxmax()
-            highest_late_day = daily_data.iloc[highest_late_idx]
+            if not daily_summary or daily_summary['days'].empty:
+                return "No daily patterns data available"
             
             # Safe formatting
-            busiest_name = str(busiest_day['day_of_week'])
-            busiest_total = self.safe_format_number(busiest_day['total_attendance'], "int")
-            busiest_unique = self.safe_format_number(busiest_day['unique_employees'], "int")
-            busiest_late = self.safe_format_number(busiest_day['late_percentage'], "percent")
+            busiest_name = daily_summary['busiest_day']
+            busiest_total = self.safe_format_number(daily_summary['busiest_total'], "int")
+            busiest_unique = self.safe_format_number(daily_summary['busiest_unique'], "int")
+            busiest_late = self.safe_format_number(daily_summary['busiest_late'], "percent")
             
-            late_name = str(highest_late_day['day_of_week'])
-            late_percent = self.safe_format_number(highest_late_day['late_percentage'], "percent")
+            late_name = daily_summary['highest_late_day']
+            late_percent = self.safe_format_number(daily_summary['highest_late_rate'], "percent")
             
-            patterns_text = f"""
+            patterns_text = io.StringIO()
+            patterns_text.write(f"""
 📅 DAILY ATTENDANCE PATTERNS
 
 Busiest Day: {busiest_name}
@@ -341,79 +487,80 @@ Busiest Day: {busiest_name}
 Highest Late Rate: {late_name} ({late_percent})
 
 Weekly Breakdown:
-"""
+""")
             
             # Add weekly breakdown safely
             try:
-                for _, row in daily_data.iterrows():
-                    day_name = str(row['day_of_week'])[:10]
-                    total_att = self.safe_format_number(row['total_attendance'], "int")
-                    late_pct = self.safe_format_number(row['late_percentage'], "percent")
-                    patterns_text += f"   {day_name:<10}: {total_att:>8} attendees ({late_pct:>6} late)\n"
+                daily_data = daily_summary['days']
+                lines = [
+                    f"   {day_name:<10}: {total_att:>8} attendees ({late_pct:>6} late)\n"
+                    for day_name, total_att, late_pct in zip(
+                        daily_data['day_of_week'].astype(str).str[:10],
+                        self._format_column(daily_data['total_attendance'], "int"),
+                        self._format_column(daily_data['late_percentage'], "percent")
+                    )
+                ]
+                patterns_text.writelines(lines)
             except Exception as e:
-                patterns_text += f"   Error processing weekly data: {e}\n"
+                patterns_text.write(f"   Error processing weekly data: {e}\n")
             
             # Summary insights
             try:
-                avg_attendance = self.safe_format_number(daily_data['total_attendance'].mean(), "int")
-                avg_late_rate = self.safe_format_number(daily_data['late_percentage'].mean(), "percent")
-                best_day = str(daily_data.loc[daily_data['late_percentage'].idxmin(), 'day_of_week'])
+                avg_attendance = self.safe_format_number(daily_summary['avg_attendance'], "int")
+                avg_late_rate = self.safe_format_number(daily_summary['avg_late_rate'], "percent")
+                best_day = daily_summary['most_punctual_day']
                 
-                patterns_text += f"""
+                patterns_text.write(f"""
 Pattern Analysis:
    • Average weekly attendance: {avg_attendance}
    • Overall late rate: {avg_late_rate}
    • Most punctual day: {best_day}
    • Advanced trend analysis applied
-"""
+""")
             except Exception as e:
-                patterns_text += f"\n💡 Analysis: Error processing insights - {e}"
+                patterns_text.write(f"\n💡 Analysis: Error processing insights - {e}")
             
-            self.daily_patterns_text.delete(1.0, tk.END)
-            self.daily_patterns_text.insert(tk.END, patterns_text)
+            return patterns_text.getvalue()
             
         except Exception as e:
-            self.daily_patterns_text.delete(1.0, tk.END)
-            self.daily_patterns_text.insert(tk.END, f"Error displaying daily patterns: {e}")
+            return f"Error displaying daily patterns: {e}"
     
-    def display_employee_performance(self):
-        """Display employee performance with safe formatting"""
+    def _render_employee_performance(self, emp_summary):
+        """Render employee performance text from the engine's precomputed summary"""
         try:
-            if 'employee_performance' not in self.analytics_data:
-                return
+            if not emp_summary or emp_summary['employees'].empty:
+                return "No employee performance data available"
             
-            emp_data = self.analytics_data['employee_performance']
-            
-            if emp_data.empty:
-                self.employee_performance_text.delete(1.0, tk.END)
-                self.employee_performance_text.insert(tk.END, "No employee performance data available")
-                return
-            
-            performance_text = """
+            performance_text = io.StringIO()
+            performance_text.write("""
 EMPLOYEE PERFORMANCE ANALYTICS
 
 Top Performers:
-"""
+""")
             
             # Top performers with safe formatting
             try:
-                top_performers = emp_data.head(min(10, len(emp_data)))
-                for i, (_, row) in enumerate(top_performers.iterrows(), 1):
-                    name = str(row['employee_name'])[:15]
-                    score = self.safe_format_number(row['punctuality_score'], "percent")
-                    performance_text += f"   {i:2d}. {name:<15} - {score:>6} punctual\n"
+                top_performers = emp_summary['top10']
+                lines = [
+                    f"   {i:2d}. {name:<15} - {score:>6} punctual\n"
+                    for i, (name, score) in enumerate(zip(
+                        top_performers['employee_name'].astype(str).str[:15],
+                        self._format_column(top_performers['punctuality_score'], "percent")
+                    ), 1)
+                ]
+                performance_text.writelines(lines)
             except Exception as e:
-                performance_text += f"   Error processing top performers: {e}\n"
+                performance_text.write(f"   Error processing top performers: {e}\n")
             
             # Performance metrics
             try:
-                total_employees = self.safe_format_number(len(emp_data), "int")
-                avg_punctuality = self.safe_format_number(emp_data['punctuality_score'].mean(), "percent")
-                best_performer = str(emp_data.iloc[0]['employee_name']) if len(emp_data) > 0 else "N/A"
-                best_score = self.safe_format_number(emp_data.iloc[0]['punctuality_score'], "percent") if len(emp_data) > 0 else "N/A"
-                avg_arrival = self.safe_format_number(emp_data['avg_arrival_hour'].mean(), "float")
+                total_employees = self.safe_format_number(len(emp_summary['employees']), "int")
+                avg_punctuality = self.safe_format_number(emp_summary['avg_punctuality'], "percent")
+                best_performer, best_score = emp_summary['best']
+                best_score = self.safe_format_number(best_score, "percent")
+                avg_arrival = self.safe_format_number(emp_summary['avg_arrival'], "float")
                 
-                performance_text += f"""
+                performance_text.write(f"""
 Performance Metrics:
    • Total employees analyzed: {total_employees}
    • Average punctuality score: {avg_punctuality}
@@ -421,32 +568,28 @@ Performance Metrics:
    • Average arrival time: {avg_arrival}:00
    
 Distribution Analysis:
-"""
+""")
                 
                 # Distribution analysis
-                excellent = len(emp_data[emp_data['punctuality_score'] > 95])
-                good = len(emp_data[(emp_data['punctuality_score'] >= 85) & (emp_data['punctuality_score'] <= 95)])
-                needs_improvement = len(emp_data[emp_data['punctuality_score'] < 85])
-                total_records = self.safe_format_number(emp_data['total_days'].sum(), "int")
+                excellent, good, needs_improvement = emp_summary['buckets']
+                total_records = self.safe_format_number(emp_summary['total_records'], "int")
                 
-                performance_text += f"   • Excellent (>95%): {excellent} employees\n"
-                performance_text += f"   • Good (85-95%): {good} employees\n"
-                performance_text += f"   • Needs Improvement (<85%): {needs_improvement} employees\n"
+                performance_text.write(f"   • Excellent (>95%): {excellent} employees\n")
+                performance_text.write(f"   • Good (85-95%): {good} employees\n")
+                performance_text.write(f"   • Needs Improvement (<85%): {needs_improvement} employees\n")
                 
-                performance_text += f"""
+                performance_text.write(f"""
 Analytics Features:
    • Analyzed {total_records} total attendance records
-"""
+""")
                 
             except Exception as e:
-                performance_text += f"\nMetrics: Error processing data - {e}"
+                performance_text.write(f"\nMetrics: Error processing data - {e}")
             
-            self.employee_performance_text.delete(1.0, tk.END)
-            self.employee_performance_text.insert(tk.END, performance_text)
+            return performance_text.getvalue()
             
         except Exception as e:
-            self.employee_performance_text.delete(1.0, tk.END)
-            self.employee_performance_text.insert(tk.END, f"Error displaying employee performance: {e}")
+            return f"Error displaying employee performance: {e}"
     
     def generate_full_report(self):
         """Generate comprehensive analytics report"""
@@ -454,35 +597,95 @@ Analytics Features:
             messagebox.showwarning("Warning", "Please run analytics first!")
             return
         
+        # Write the report in the background; dialogs come back on the Tk thread
+        analytics_data = self.analytics_data
+        self.report_button.config(state=tk.DISABLED)
+        threading.Thread(target=self._write_report, args=(analytics_data,), daemon=True).start()
+    
+    def _write_report(self, analytics_data):
+        """Report worker - write all analytics sections to a text file"""
+        root = self.main_window.root
         try:
             # Create report file
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_filename = f"report_{timestamp}.txt"
 
-            with open(report_filename, 'w', encoding='utf-8') as f:
-                f.write("="*80 + "\n")
-                f.write("FACE RECOGNITION ANALYTICS REPORT\n")
-                f.write("Data Analytics Engine - Comprehensive Analysis\n")
-                f.write("="*80 + "\n\n")
-                f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                
-                # Write all analytics sections safely
-                for section, data in self.analytics_data.items():
-                    try:
-                        f.write(f"\n{section.upper().replace('_', ' ')}\n")
-                        f.write("-" * 50 + "\n")
-                        if hasattr(data, 'to_string'):  # pandas DataFrame
-                            f.write(data.to_string(index=False))
-                        else:
-                            f.write(str(data))
-                        f.write("\n\n")
-                    except Exception as e:
-                        f.write(f"Error writing section {section}: {e}\n\n")
+            # Assemble the whole report in memory, then hand it to the OS in one write
+            report_text = io.StringIO()
+            report_text.write("="*80 + "\n")
+            report_text.write("FACE RECOGNITION ANALYTICS REPORT\n")
+            report_text.write("Data Analytics Engine - Comprehensive Analysis\n")
+            report_text.write("="*80 + "\n\n")
+            report_text.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            
+            # Write all analytics sections safely
+            for section, data in analytics_data.items():
+                try:
+                    report_text.write(f"\n{section.upper().replace('_', ' ')}\n")
+                    report_text.write("-" * 50 + "\n")
+                    if hasattr(data, 'to_csv'):  # pandas DataFrame
+                        data.to_csv(report_text, sep='\t', index=False, lineterminator='\n')
+                    elif isinstance(data, dict):
+                        for key, value in data.items():
+                            if hasattr(value, 'to_csv'):
+                                report_text.write(f"{key}:\n")
+                                value.to_csv(report_text, sep='\t', index=False, lineterminator='\n')
+                            else:
+                                report_text.write(f"{key}: {value}\n")
+                    else:
+                        report_text.write(str(data))
+                    report_text.write("\n\n")
+                except Exception as e:
+                    report_text.write(f"Error writing section {section}: {e}\n\n")
             
-            messagebox.showinfo("Success", f"Advanced analytics report saved as: {report_filename}")
+            with open(report_filename, 'wb') as report_file:
+                report_file.write(report_text.getvalue().encode('utf-8'))
+            
+            # Typed binary copies of the tables for reloading with pd.read_parquet,
+            # kept together in one folder per report
+            tables_dir = f"report_{timestamp}_tables"
+            table_count = self._write_report_tables(analytics_data, tables_dir)
+            
+            root.after(0, lambda: messagebox.showinfo(
+                "Success", f"Advanced analytics report saved as: {report_filename}\n"
+                           f"({table_count} tables also saved as Parquet in {tables_dir})"))
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+            error_msg = f"Failed to generate report: {str(e)}"
+            root.after(0, lambda: messagebox.showerror("Error", error_msg))
+        
+        finally:
+            root.after(0, lambda: self.report_button.config(state=tk.NORMAL))
+    
+    def _write_report_tables(self, analytics_data, directory):
+        """
+        Save every non-empty report table as <directory>/<section>[_<key>].parquet
+        
+        Returns the number of files written; a table that cannot be saved is
+        skipped (the text report already holds it).
+        """
+        tables = []
+        for section, data in analytics_data.items():
+            if hasattr(data, 'to_parquet'):
+                tables.append((section, data))
+            elif isinstance(data, dict):
+                tables.extend((f"{section}_{key}", value) for key, value in data.items()
+                              if hasattr(value, 'to_parquet'))
+        
+        written = 0
+        for name, table in tables:
+            if table.empty:
+                continue
+            try:
+                os.makedirs(directory, exist_ok=True)
+                table.to_parquet(os.path.join(directory, f"{name}.parquet"), index=False, compression='zstd')
+                written += 1
+            except ImportError as e:
+                print(f"⚠️ Parquet export not available: {e}")
+                break
+            except Exception as e:
+                print(f"⚠️ Could not save {name} as Parquet: {e}")
+        return written
     
     def refresh_analytics_display(self):
         """Refresh analytics display"""
@@ -492,9 +695,40 @@ Analytics Features:
             self.update_status("No analytics data to refresh. Run analytics first!")
     
     def update_status(self, message):
-        """Update analytics status message"""
+        """Update analytics status message (safe to call from worker threads)"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        self.analytics_status.config(text=f"{timestamp} - {message}")
+        status = f"{timestamp} - {message}"
+        
+        # On the Tk thread with nothing queued ahead, show it right away
+        if not self._status_polling and threading.current_thread() is threading.main_thread():
+            self.analytics_status.config(text=status)
+        else:
+            self._status_queue.put(status)
+    
+    def _start_status_updates(self):
+        """Apply queued status messages every 50 ms until the analytics run ends"""
+        self._analytics_running = True
+        if not self._status_polling:
+            self._status_polling = True
+            self.notebook.after(50, self._drain_status)
+    
+    def _drain_status(self):
+        """Show the newest queued status message on the Tk thread"""
+        latest = None
+        try:
+            while True:
+                latest = self._status_queue.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if latest is not None:
+            self.analytics_status.config(text=latest)
+        
+        # Keep polling while the worker may still post messages
+        if self._analytics_running or not self._status_queue.empty():
+            self.notebook.after(50, self._drain_status)
+        else:
+            self._status_polling = False
     
     # EXISTING METHODS (unchanged)
     
@@ -503,7 +737,8 @@ Analytics Features:
         info_frame = ttk.Frame(self.notebook)
         self.notebook.add(info_frame, text="System Info")
         
-        self.stats_text = tk.Text(info_frame, width=40, height=15, wrap=tk.WORD)
+        self.stats_text = tk.Text(info_frame, width=40, height=15, wrap=tk.WORD,
+                                  undo=False, state=tk.DISABLED)
         self.stats_text.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
     
     def create_attendance_tab(self):
@@ -511,23 +746,40 @@ Analytics Features:
         attendance_frame = ttk.Frame(self.notebook)
         self.notebook.add(attendance_frame, text="Today's Attendance")
         
-        self.attendance_listbox = tk.Listbox(attendance_frame)
+        self._attendance_items = tk.StringVar(value=())
+        self.attendance_listbox = tk.Listbox(attendance_frame, listvariable=self._attendance_items)
         self.attendance_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        self.attendance_refreshed_label = ttk.Label(attendance_frame, text="Last refreshed: --")
+        self.attendance_refreshed_label.pack(padx=10, anchor=tk.W)
+        
+        att_buttons = ttk.Frame(attendance_frame)
+        att_buttons.pack(pady=5)
+        
         ttk.Button(
-            attendance_frame, 
+            att_buttons, 
             text="Refresh Attendance", 
             command=self.refresh_attendance
-        ).pack(pady=5)
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Button(
+            att_buttons, 
+            text="Force Refresh", 
+            command=lambda: self.refresh_attendance(force=True)
+        ).pack(side=tk.LEFT, padx=2)
     
     def create_employee_tab(self):
         """Create employee management tab"""
         emp_frame = ttk.Frame(self.notebook)
         self.notebook.add(emp_frame, text="Employees")
         
-        self.employee_listbox = tk.Listbox(emp_frame)
+        self._employee_items = tk.StringVar(value=())
+        self._employee_index = []
+        self.employee_listbox = tk.Listbox(emp_frame, listvariable=self._employee_items)
         self.employee_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        self.employee_refreshed_label = ttk.Label(emp_frame, text="Last refreshed: --")
+        self.employee_refreshed_label.pack(padx=10, anchor=tk.W)
+        
         # Employee management buttons
         emp_buttons = ttk.Frame(emp_frame)
         emp_buttons.pack(fill=tk.X, padx=10, pady=5)
@@ -540,6 +792,8 @@ Analytics Features:
                   command=self.manual_face_link).pack(side=tk.LEFT, padx=2)
         ttk.Button(emp_buttons, text="Refresh", 
                   command=self.refresh_employees).pack(side=tk.LEFT, padx=2)
+        ttk.Button(emp_buttons, text="Force Refresh", 
+                  command=lambda: self.refresh_employees(force=True)).pack(side=tk.LEFT, padx=2)
     
     def update_system_info(self, stats):
         """Update system information display"""
@@ -565,52 +819,139 @@ DATA ANALYTICS AVAILABLE!
 Last Updated: {datetime.now().strftime('%H:%M:%S')}
 """
         
-        self.stats_text.delete(1.0, tk.END)
-        self.stats_text.insert(1.0, status_text)
+        self._set_text(self.stats_text, status_text)
+    
+    def invalidate_cache(self, *keys):
+        """Drop cached query results so the next refresh reloads them"""
+        for key in keys:
+            self._cache.pop(key, None)
     
-    def refresh_employees(self):
-        """Refresh the employee list"""
-        self.employee_listbox.delete(0, tk.END)
+    def _show_refreshed(self, label, key):
+        """Show when the cached data behind a list was loaded"""
+        entry = self._cache.get(key)
+        if entry is not None:
+            label.config(text=f"Last refreshed: {datetime.fromtimestamp(entry[0]).strftime('%H:%M:%S')}")
+    
+    def _load_employees(self, force=False):
+        """
+        Employee list rows (name + face status), built on the worker thread
         
-        try:
-            employees = self.main_window.emp_db.list_employees()
-            
-            if not employees:
-                self.employee_listbox.insert(tk.END, "No employees found - Add employees first")
-                return
-            
-            for emp in employees:
-                face_count = self.main_window.face_db.faces_collection.count_documents(
-                    {"employee_id": emp['employee_id']}
-                )
-                face_status = "✅" if face_count > 0 else "❌"
-                display_text = f"{emp['name']} {face_status}"
-                self.employee_listbox.insert(tk.END, display_text)
-                
-        except Exception as e:
-            print(f"Error refreshing employees: {e}")
-            self.employee_listbox.insert(tk.END, f"Error loading employees: {e}")
+        Returns (rows, employees) - the employee dicts line up with the rows.
+        force also bypasses the database layer's employee cache.
+        """
+        employees = self.main_window.emp_db.list_employees(fields=["name", "employee_id"], force=force)
+        if not employees:
+            return [], []
+        
+        emp_df = pd.DataFrame.from_records(employees, columns=["name", "employee_id"])
+        
+        # Face sample counts for all employees in one round-trip
+        face_counts = self.main_window.face_db.count_faces_by_employee(emp_df['employee_id'].tolist())
+        
+        has_faces = emp_df['employee_id'].map(face_counts).fillna(0).to_numpy() > 0
+        rows = (emp_df['name'].astype(str) + np.where(has_faces, " ✅", " ❌")).tolist()
+        return rows, employees
     
-    def refresh_attendance(self):
-        """Refresh today's attendance list"""
-        self.attendance_listbox.delete(0, tk.END)
+    def _load_attendance(self):
+        """Today's attendance list rows, built on the worker thread"""
+        # Only the fields shown in the list come over the wire
+        records = self.main_window.emp_db.get_today_attendance(
+            fields=["employee_name", "enter_time", "is_late"]
+        )
+        return self._attendance_rows(records)
+    
+    @staticmethod
+    def _attendance_rows(records):
+        """Attendance list rows for attendance records"""
+        if not records:
+            return []
+        
+        att_df = pd.DataFrame.from_records(records, columns=["employee_name", "enter_time", "is_late"])
+        status = np.where(att_df['is_late'].fillna(False).astype(bool), " (LATE)", " (ON TIME)")
+        return (
+            att_df['employee_name'].astype(str) + " - "
+            + pd.to_datetime(att_df['enter_time']).dt.strftime('%H:%M:%S') + status
+        ).tolist()
+    
+    def _refresh_cached(self, key, ttl, loader, show, on_error, force=False):
+        """
+        Pass a cached query result to show(), loading it when stale
+        
+        The load runs on the shared database worker thread; show/on_error are
+        called back on the Tk main thread.
+        """
+        entry = self._cache.get(key)
+        if not force and entry is not None and time.time() - entry[0] <= ttl:
+            show(entry[1])
+            return
         
-        try:
-            today_attendance = self.main_window.emp_db.get_today_attendance()
-            
-            if not today_attendance:
-                self.attendance_listbox.insert(tk.END, "No attendance records for today")
-                return
-            
-            for att in today_attendance:
-                status = "LATE" if att['is_late'] else "ON TIME"
-                time_str = att['enter_time'].strftime('%H:%M:%S')
-                display_text = f"{att['employee_name']} - {time_str} ({status})"
-                self.attendance_listbox.insert(tk.END, display_text)
-                
-        except Exception as e:
-            print(f"Error refreshing attendance: {e}")
-            self.attendance_listbox.insert(tk.END, f"Error loading attendance: {e}")
+        def loaded(value):
+            self._cache[key] = (time.time(), value)
+            show(value)
+        
+        run_db_task(self.notebook, loader, loaded, on_error)
+    
+    def refresh_employees(self, force=False):
+        """Refresh the employee list (force bypasses both employee caches)"""
+        self._refresh_cached(
+            "employees", self.EMPLOYEE_CACHE_TTL, lambda: self._load_employees(force),
+            self._show_employees, self._show_employees_error, force
+        )
+    
+    def _set_items(self, items_var, items):
+        """Replace a Listbox's rows in one Tcl call, skipping unchanged lists"""
+        items = tuple(items)
+        if self._shown_text.get(str(items_var)) == items:
+            return
+        
+        items_var.set(items)
+        self._shown_text[str(items_var)] = items
+    
+    def _show_employees(self, data):
+        """Fill the employee list from prebuilt rows"""
+        items, employees = data
+        self._employee_index = employees
+        self._show_refreshed(self.employee_refreshed_label, "employees")
+        self._set_items(self._employee_items, items or ["No employees found - Add employees first"])
+    
+    def _show_employees_error(self, e):
+        """Show an employee loading error in the list"""
+        print(f"Error refreshing employees: {e}")
+        self._employee_index = []
+        self._set_items(self._employee_items, [f"Error loading employees: {e}"])
+    
+    def refresh_attendance(self, force=False):
+        """Refresh today's attendance list (force bypasses the short-lived cache)"""
+        self._refresh_cached(
+            "attendance", self.ATTENDANCE_CACHE_TTL, self._load_attendance,
+            self._show_attendance, self._show_attendance_error, force
+        )
+    
+    def _show_attendance(self, items):
+        """Fill the attendance list from prebuilt rows"""
+        self._show_refreshed(self.attendance_refreshed_label, "attendance")
+        self._set_items(self._attendance_items, items or ["No attendance records for today"])
+    
+    def append_attendance_row(self, record):
+        """Add a just-recorded attendance record to the list without re-querying"""
+        entry = self._cache.get("attendance")
+        if entry is None:
+            # Nothing loaded yet - a normal refresh picks the record up
+            self.refresh_attendance()
+            return
+        
+        # Records come in entry-time order; an already-recorded one is skipped.
+        # The load time is kept so the TTL still re-syncs with the database
+        row = self._attendance_rows([record])[0]
+        if row not in entry[1]:
+            entry = (entry[0], entry[1] + [row])
+            self._cache["attendance"] = entry
+        self._show_attendance(entry[1])
+    
+    def _show_attendance_error(self, e):
+        """Show an attendance loading error in the list"""
+        print(f"Error refreshing attendance: {e}")
+        self._set_items(self._attendance_items, [f"Error loading attendance: {e}"])
     
     def get_selected_employee(self):
         """Get currently selected employee"""
@@ -618,13 +959,11 @@ Last Updated: {datetime.now().strftime('%H:%M:%S')}
         if not selection:
             return None
         
-        # Get employee name from selection (remove status emoji)
-        employee_line = self.employee_listbox.get(selection[0])
-        if "No employees found" in employee_line or "Error" in employee_line:
+        # Rows line up with the employees they were built from
+        # (placeholder and error rows have no entry)
+        if selection[0] >= len(self._employee_index):
             return None
-        
-        employee_name = employee_line.split(" ✅")[0].split(" ❌")[0]
-        return self.main_window.emp_db.get_employee_by_name(employee_name)
+        return self._employee_index[selection[0]]
     
     def manual_face_link(self):
         """Manually link existing face to employee"""
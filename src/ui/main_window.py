@@ -8,6 +8,7 @@ from tkinter import ttk, messagebox
 import threading
 import time
 from datetime import datetime
+import numpy as np
 
 from .video_panel import VideoPanel
 from .info_tabs import InfoTabs
@@ -19,6 +20,21 @@ from ..processing.face_processor import ImprovedFaceProcessor
 class MainWindow:
     """Main application window"""
     
+    # Status display: check for changes every 250 ms right after a change,
+    # backing off to once a second while idle. The database counts reload
+    # 250 ms after a change, with the spacing doubling (up to 8 s) while
+    # changes keep coming; everything reloads every 30 s regardless
+    STATUS_TICK_MIN_MS = 250
+    STATUS_TICK_MAX_MS = 1000
+    STATS_MIN_INTERVAL = 0.25
+    STATS_MAX_INTERVAL = 8
+    STATUS_FALLBACK_INTERVAL = 30
+    
+    # Seconds before the same face can record attendance again; the
+    # per-name timestamps are swept once more than 256 names are tracked
+    ATTENDANCE_COOLDOWN = 30
+    MAX_TRACKED_NAMES = 256
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Face Recognition Attendance System")
@@ -32,7 +48,8 @@ class MainWindow:
         self.face_processor = ImprovedFaceProcessor()
         
         # Load recognition data
-        self.known_encodings = []
+        self.known_matrix = np.empty((0, 128), dtype=np.float32)
+        self.known_norms = np.empty(0, dtype=np.float32)
         self.known_names = []
         self.employee_map = {}
         self.last_recognition_time = {}
@@ -42,6 +59,13 @@ class MainWindow:
         self.video_thread = None
         self.camera_available = False
         
+        # Status display parts to reload on the next tick (set by mutations)
+        self._dirty = {'stats': True, 'attendance': True}
+        self._last_stats_refresh = 0.0
+        self._last_full_refresh = time.time()
+        self._stats_interval = self.STATS_MIN_INTERVAL
+        self._tick_ms = self.STATUS_TICK_MIN_MS
+        
         # Load known faces
         self.load_known_faces()
         
@@ -81,21 +105,31 @@ class MainWindow:
             
             all_faces = self.face_db.get_all_faces()
             self.known_names = [face[0] for face in all_faces]
-            self.known_encodings = [face[1] for face in all_faces]
             
-            # Create mapping from face names to employee IDs
-            self.employee_map = {}
-            for face_name in set(self.known_names):
-                employee = self.emp_db.find_employee_by_face_name(face_name)
-                if employee:
-                    self.employee_map[face_name] = employee['employee_id']
+            # Keep all encodings in one contiguous (N, 128) float32 matrix
+            if all_faces:
+                self.known_matrix = np.ascontiguousarray(
+                    np.vstack([face[1] for face in all_faces]).astype(np.float32)
+                )
+            else:
+                self.known_matrix = np.empty((0, 128), dtype=np.float32)
+            self.known_norms = np.linalg.norm(self.known_matrix, axis=1)
             
-            print(f"✅ Loaded {len(self.known_encodings)} face encodings")
+            # Create mapping from face names to employee IDs (one batched lookup)
+            self.employee_map = {
+                match['face_name']: match['employee_id']
+                for match in self.emp_db.find_employees_by_face_names(set(self.known_names))
+            }
+            
+            self.mark_dirty('stats')
+            
+            print(f"✅ Loaded {len(self.known_matrix)} face encodings")
             print(f"✅ Mapped {len(self.employee_map)} faces to employees") 
             
         except Exception as e:
             print(f"❌ Error loading faces: {e}")
-            self.known_encodings = []
+            self.known_matrix = np.empty((0, 128), dtype=np.float32)
+            self.known_norms = np.empty(0, dtype=np.float32)
             self.known_names = []
             self.employee_map = {}
     
@@ -117,7 +151,8 @@ class MainWindow:
             self.video_thread.start()
             
             # Update status
-            mode = "Recognition" if self.face_processor.use_face_recognition and self.known_encodings else "Detection"
+            self.mark_dirty('stats')
+            mode = "Recognition" if self.face_processor.use_face_recognition and len(self.known_matrix) else "Detection"
             self.update_status_bar(f"Face {mode} started")
             
         except Exception as e:
@@ -134,6 +169,7 @@ class MainWindow:
         self.video_panel.stop_video_processing()
         
         # Update status
+        self.mark_dirty('stats')
         self.update_status_bar("Face recognition stopped")
     
     def video_processing_loop(self):
@@ -150,7 +186,8 @@ class MainWindow:
                 
                 # Let video panel handle the actual processing
                 recognition_results = self.video_panel.process_frame(
-                    self.known_encodings, 
+                    self.known_matrix, 
+                    self.known_norms, 
                     self.known_names, 
                     self.face_processor
                 )
@@ -172,8 +209,9 @@ class MainWindow:
 
                 
                 # Reset error counter on successful processing
+                # (no sleep - process_frame blocks in VideoStream.read() until
+                # the camera delivers a new frame, which paces the loop)
                 consecutive_errors = 0
-                time.sleep(0.03)  # ~30 FPS
                 
             except Exception as e:
                 consecutive_errors += 1
@@ -196,8 +234,16 @@ class MainWindow:
     def should_record_attendance(self, name):
         """Check if we should record attendance (avoid spam)"""
         current_time = time.time()
+        
+        # Timestamps past the cooldown no longer matter - drop them
+        if len(self.last_recognition_time) > self.MAX_TRACKED_NAMES:
+            self.last_recognition_time = {
+                seen_name: seen_time for seen_name, seen_time in self.last_recognition_time.items()
+                if current_time - seen_time <= self.ATTENDANCE_COOLDOWN
+            }
+        
         if name in self.last_recognition_time:
-            return current_time - self.last_recognition_time[name] > 30
+            return current_time - self.last_recognition_time[name] > self.ATTENDANCE_COOLDOWN
         return True
     
     def process_recognition(self, face_name, confidence):
@@ -207,13 +253,13 @@ class MainWindow:
                 employee_id = self.employee_map[face_name]
                 
                 # Record attendance
-                self.emp_db.record_attendance(employee_id)
+                record = self.emp_db.record_attendance(employee_id)
                 
                 # Update last recognition time
                 self.last_recognition_time[face_name] = time.time()
                 
-                # Update displays
-                self.root.after(0, self.refresh_attendance)
+                # Show the record directly - no need to re-query the list
+                self.root.after(0, self.info_tabs.append_attendance_row, record)
                 
                 # Show success message
                 success_msg = f"✅ Attendance recorded for {face_name}"
@@ -235,6 +281,7 @@ class MainWindow:
                     confidence=confidence,
                     location=location
                 )
+                self.mark_dirty('stats')
                 print(f"📝 Recorded recognition event: {name} (confidence: {confidence:.2f})")
         except Exception as e:
             print(f"❌ Error recording recognition event: {e}")
@@ -243,7 +290,9 @@ class MainWindow:
     def add_employee(self):
         """Add a new employee"""
         dialog = EmployeeDialog(self.root, self.emp_db)
+        self.root.wait_window(dialog.dialog)
         if dialog.result:
+            self.mark_dirty('stats')
             self.refresh_employees()
             messagebox.showinfo("Success", f"Employee {dialog.result} added successfully!")
     
@@ -277,15 +326,56 @@ class MainWindow:
         self.refresh_attendance()
     
     def refresh_employees(self):
-        """Refresh employee list"""
+        """Refresh employee list (after changes, so cached results are dropped)"""
+        self.info_tabs.invalidate_cache("employees")
         self.info_tabs.refresh_employees()
     
     def refresh_attendance(self):
-        """Refresh attendance list"""
+        """Refresh attendance list (after changes, so cached results are dropped)"""
+        self.info_tabs.invalidate_cache("attendance")
         self.info_tabs.refresh_attendance()
     
+    def mark_dirty(self, *parts):
+        """Flag status display parts ('stats', 'attendance') for the next tick"""
+        for part in parts:
+            self._dirty[part] = True
+    
     def update_status(self):
-        """Update system status information"""
+        """Update the parts of the system status that changed since the last tick"""
+        now = time.time()
+        
+        # Periodic fallback catches changes made outside this window
+        if now - self._last_full_refresh >= self.STATUS_FALLBACK_INTERVAL:
+            self._last_full_refresh = now
+            self.mark_dirty('stats', 'attendance')
+        
+        busy = self._dirty['stats'] or self._dirty['attendance']
+        
+        since_stats = now - self._last_stats_refresh
+        if self._dirty['stats'] and since_stats >= self._stats_interval:
+            self._dirty['stats'] = False
+            self._last_stats_refresh = now
+            
+            # Back-to-back changes widen the spacing; a quiet spell resets it
+            if since_stats > 2 * self._stats_interval:
+                self._stats_interval = self.STATS_MIN_INTERVAL
+            else:
+                self._stats_interval = min(self._stats_interval * 2, self.STATS_MAX_INTERVAL)
+            self._update_stats()
+        
+        if self._dirty['attendance']:
+            self._dirty['attendance'] = False
+            self.info_tabs.refresh_attendance()
+        
+        # Schedule next check - soon after a change, backing off while idle
+        if busy:
+            self._tick_ms = self.STATUS_TICK_MIN_MS
+        else:
+            self._tick_ms = min(self._tick_ms * 2, self.STATUS_TICK_MAX_MS)
+        self.root.after(self._tick_ms, self.update_status)
+    
+    def _update_stats(self):
+        """Reload the database counts shown on the System Info tab"""
         try:
             # Get database stats
             employee_count = self.emp_db.employees_collection.count_documents({"is_active": True})
@@ -296,21 +386,16 @@ class MainWindow:
             self.info_tabs.update_system_info({
                 'employee_count': employee_count,
                 'face_count': face_count,
-                'known_faces': len(self.known_encodings),
+                'known_faces': len(self.known_matrix),
                 'event_count': event_count,
                 'is_running': self.is_running,
                 'face_recognition_available': self.face_processor.use_face_recognition,
                 'camera_available': self.camera_available
             })
             
-            # Update attendance
-            self.refresh_attendance()
-            
         except Exception as e:
             print(f"Error updating status: {e}")
-        
-        # Schedule next update
-        self.root.after(5000, self.update_status)
+            self.mark_dirty('stats')
     
     def update_status_bar(self, message):
         """Update the status bar"""
@@ -322,6 +407,10 @@ class MainWindow:
         if self.is_running:
             self.stop_recognition()
         
+        # Stop the Spark session the analytics engine keeps between runs
+        if self.info_tabs.analytics_engine is not None:
+            self.info_tabs.analytics_engine.close()
+        
         # Close database connections
         self.emp_db.close()
         self.face_db.close()
@@ -7,6 +7,8 @@ import tkinter as tk
 from tkinter import ttk
 import cv2
 import time
+import queue
+import numpy as np
 from PIL import Image, ImageTk
 
 from ..processing.video_stream import VideoStream
@@ -23,11 +25,51 @@ class VideoPanel:
         self.video_stream = None
         self.motion_detector = None
         
+        # Pipeline stages: VideoStream capture thread -> processing thread -> Tk display
+        self._display_queue = None
+        
         # Motion detection state
         self.last_motion_time = 0
         self.face_detection_active = False
         self.motion_cooldown = 3.0
         
+        # Region where motion was last seen; recognition only looks there
+        self.motion_box = None
+        self.roi_padding = 0.25
+        self.min_roi_size = 50
+        # Crop edges snap to this grid so the face processor's buffers
+        # (sized by the crop shape) are reused instead of reallocated
+        self.roi_grid = 32
+        
+        # Motion only needs checking a few times per second (less often
+        # when no faces are enrolled and it only drives the overlay)
+        self.motion_interval = 3
+        self.standby_motion_interval = 6
+        self._frame_idx = 0
+        
+        # Last recognized scene, reused while the view stays unchanged
+        self.scene_change_threshold = 2.0
+        self._last_small = None
+        self._last_results = []
+        
+        # Rendered status overlay, redrawn only when its text changes
+        self._overlay_key = None
+        self._overlay_cache = None
+        
+        # Display scaling: frames are scaled to the label's inner size (capped
+        # at max_display_size) into reused buffers and one reused PhotoImage
+        self.max_display_size = (800, 600)
+        self._display_size = self.max_display_size
+        self._display_bgr = None
+        self._display_rgb = None
+        self._photo = None
+        
+        # Recognition status text: latest value from the processing thread,
+        # applied by one pending idle callback at a time
+        self._pending_status = ""
+        self._shown_status = ""
+        self._status_scheduled = False
+        
         # Create UI
         self.create_widgets()
     
@@ -46,6 +88,7 @@ class VideoPanel:
             height=30
         )
         self.video_label.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        self.video_label.bind("<Configure>", self._on_video_resize)
         
         # Control buttons
         self.create_control_buttons()
@@ -87,6 +130,13 @@ class VideoPanel:
             # Initialize video stream
             self.video_stream = VideoStream(0).start()
             self.motion_detector = MotionDetector(threshold=25, min_area=500)
+            self._frame_idx = 0
+            
+            # Bounded queue gives back-pressure towards the display
+            self._display_queue = queue.Queue(maxsize=2)
+            
+            # Display runs on the Tk main thread
+            self.main_window.root.after(0, self._display_loop)
             
             # Update button states
             self.start_button.config(state=tk.DISABLED)
@@ -107,6 +157,9 @@ class VideoPanel:
         
         # Reset motion detector
         self.motion_detector = None
+        self.motion_box = None
+        self._last_small = None
+        self._last_results = []
         
         # Update button states
         self.start_button.config(state=tk.NORMAL)
@@ -114,14 +167,22 @@ class VideoPanel:
         
         # Clear video display
         self.video_label.config(image="", text="Camera feed stopped")
+        self._photo = None
         self.recognition_status.config(text="")
+        self._pending_status = self._shown_status = ""
         
         print("📴 Video processing stopped")
     
-    def process_frame(self, known_encodings, known_names, face_processor):
+    def process_frame(self, known_matrix, known_norms, known_names, face_processor):
         """
         Process a single video frame
         
+        Args:
+            known_matrix: (N, 128) float32 matrix of known face encodings
+            known_norms: Precomputed L2 norms of the rows of known_matrix
+            known_names: Names matching the rows of known_matrix
+            face_processor: Face processor used for recognition
+        
         Returns:
             recognition_results: List of recognition results
         """
@@ -129,30 +190,66 @@ class VideoPanel:
             return []
         
         try:
-            # Read frame
+            # Newest camera frame; stale buffered frames are skipped
             ret, frame = self.video_stream.read()
             if not ret:
                 return []
             
-            # Motion detection
-            motion_detected, motion_frame = self.motion_detector.detect(frame)
+            # Motion detection on every Nth frame; in between the last result
+            # is held (and its boxes redrawn on the new frame)
+            self._frame_idx += 1
+            interval = self.motion_interval if len(known_matrix) else self.standby_motion_interval
+            if self._frame_idx % interval == 0:
+                motion_detected, motion_frame = self.motion_detector.detect(frame)
+            else:
+                motion_detected = self.motion_detector.motion_detected
+                motion_frame = self.motion_detector.draw_motion(frame)
             current_time = time.time()
             
             # Update motion state
             if motion_detected:
                 self.last_motion_time = current_time
                 self.face_detection_active = True
+                self.motion_box = self.motion_detector.motion_box
             elif current_time - self.last_motion_time > self.motion_cooldown:
                 self.face_detection_active = False
+                self.motion_box = None
+            
+            roi = self._recognition_roi(frame.shape) if self.face_detection_active else None
             
             recognition_results = []
             
-            # Face recognition if active
-            if self.face_detection_active and known_encodings:
-                processed_frame, results = face_processor.recognize_faces(
-                    frame, known_encodings, known_names, threshold=0.6
-                )
-                recognition_results = results
+            # Face recognition if active, restricted to the motion region
+            if roi is not None and len(known_matrix):
+                x0, y0, x1, y1 = roi
+                
+                # Thumbnail of the region recognition looks at, so a change
+                # inside it is not diluted by the rest of the frame
+                small = cv2.resize(frame[y0:y1, x0:x1], (64, 64), interpolation=cv2.INTER_AREA)
+                processed_frame = frame
+                
+                if self._is_same_scene(small):
+                    # Region unchanged since the last recognition - draw its results,
+                    # but report nothing new so no events/attendance are recorded again
+                    results = self._last_results
+                    face_processor.draw_results(processed_frame, results)
+                    recognition_results = []
+                else:
+                    face_roi, roi_results = face_processor.recognize_faces(
+                        frame[y0:y1, x0:x1], known_matrix, known_names,
+                        threshold=0.6, known_norms=known_norms
+                    )
+                    processed_frame[y0:y1, x0:x1] = face_roi
+                    
+                    # Map locations from the crop back to full-frame coordinates
+                    results = [
+                        (name, confidence, (top + y0, right + x0, bottom + y0, left + x0))
+                        for name, confidence, (top, right, bottom, left) in roi_results
+                    ]
+                    self._last_small = small
+                    self._last_results = results
+                    recognition_results = results
+                
                 display_frame = processed_frame
                 
                 # Update recognition status
@@ -172,8 +269,11 @@ class VideoPanel:
             # Add status overlay
             self.add_status_overlay(display_frame)
             
-            # Update video display
-            self.update_video_display(display_frame)
+            # Hand the frame to the display stage
+            try:
+                self._display_queue.put(display_frame, timeout=0.5)
+            except queue.Full:
+                pass
             
             return recognition_results
             
@@ -181,15 +281,54 @@ class VideoPanel:
             print(f"Frame processing error: {e}")
             return []
     
+    def _display_loop(self):
+        """Display stage - show processed frames on the Tk main thread"""
+        if not self.video_stream:
+            return
+        
+        try:
+            frame = self._display_queue.get_nowait()
+        except queue.Empty:
+            frame = None
+        
+        if frame is not None:
+            self.update_video_display(frame)
+        
+        self.main_window.root.after(15, self._display_loop)
+    
+    def _recognition_roi(self, frame_shape):
+        """Padded crop (x0, y0, x1, y1) around the motion region, or None if too small"""
+        if self.motion_box is None:
+            return None
+        
+        x0, y0, x1, y1 = self.motion_box
+        if x1 - x0 < self.min_roi_size or y1 - y0 < self.min_roi_size:
+            return None
+        
+        height, width = frame_shape[:2]
+        pad_x = int((x1 - x0) * self.roi_padding)
+        pad_y = int((y1 - y0) * self.roi_padding)
+        
+        # Round outwards to the grid, then clamp to the frame
+        grid = self.roi_grid
+        return (max(0, (x0 - pad_x) // grid * grid), max(0, (y0 - pad_y) // grid * grid),
+                min(width, -(-(x1 + pad_x) // grid) * grid), min(height, -(-(y1 + pad_y) // grid) * grid))
+    
+    def _is_same_scene(self, small):
+        """Check if a downsampled recognition region matches the last recognized one"""
+        if self._last_small is None:
+            return False
+        diff = float(np.mean(cv2.absdiff(small, self._last_small)))
+        return diff < self.scene_change_threshold
+    
     def add_status_overlay(self, frame):
         """Add status overlay to frame"""
         # System status
         status = "ACTIVE: Face Recognition" if self.face_detection_active else "STANDBY: Motion Detection"
         color = (0, 255, 0) if self.face_detection_active else (128, 128, 128)
-        cv2.putText(frame, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
         
         # Mode info
-        has_faces = len(self.main_window.known_encodings) > 0
+        has_faces = len(self.main_window.known_matrix) > 0
         has_recognition = self.main_window.face_processor.use_face_recognition
         
         if has_recognition and has_faces:
@@ -202,38 +341,91 @@ class VideoPanel:
             mode_text = "DETECTION ONLY"
             mode_color = (255, 255, 0)
         
-        cv2.putText(frame, mode_text, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, mode_color, 1)
+        # Re-render the text only when it changes, then stamp the cached pixels
+        overlay_key = (status, mode_text, frame.shape[1])
+        if overlay_key != self._overlay_key:
+            self._overlay_cache = self._render_status_overlay(
+                frame.shape[1], status, color, mode_text, mode_color
+            )
+            self._overlay_key = overlay_key
+        
+        overlay, mask = self._overlay_cache
+        region = frame[:overlay.shape[0]]
+        np.copyto(region, overlay[:region.shape[0]], where=mask[:region.shape[0]])
+    
+    def _render_status_overlay(self, width, status, color, mode_text, mode_color):
+        """Render the status text once into an overlay strip and its mask"""
+        overlay = np.zeros((70, width, 3), dtype=np.uint8)
+        cv2.putText(overlay, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+        cv2.putText(overlay, mode_text, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, mode_color, 1)
+        mask = overlay.any(axis=2, keepdims=True)
+        return overlay, mask
+    
+    def _on_video_resize(self, event):
+        """Scale frames to the label's inner size, at most max_display_size"""
+        label = self.video_label
+        border = int(str(label.cget("borderwidth"))) + int(str(label.cget("highlightthickness")))
+        inner_width = event.width - 2 * (border + int(str(label.cget("padx"))))
+        inner_height = event.height - 2 * (border + int(str(label.cget("pady"))))
+        
+        max_width, max_height = self.max_display_size
+        self._display_size = (min(max_width, inner_width), min(max_height, inner_height))
     
     def update_video_display(self, frame):
-        """Update the video display with larger size"""
+        """Update the video display, scaled to the visible label area"""
         try:
-            # Resize frame for display
-            display_frame = cv2.resize(frame, (800, 600))
+            width, height = self._display_size
+            if width < 1 or height < 1:
+                return
             
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
+            # (Re)allocate the display buffers when the target size changes
+            if self._display_rgb is None or self._display_rgb.shape[:2] != (height, width):
+                self._display_bgr = np.empty((height, width, 3), dtype=np.uint8)
+                self._display_rgb = np.empty_like(self._display_bgr)
+                self._photo = None
             
-            # Convert to PIL Image
-            pil_image = Image.fromarray(rgb_frame)
+            # Resize frame for display and convert BGR to RGB, in place
+            interpolation = cv2.INTER_AREA if width < frame.shape[1] else cv2.INTER_LINEAR
+            cv2.resize(frame, (width, height), dst=self._display_bgr, interpolation=interpolation)
+            cv2.cvtColor(self._display_bgr, cv2.COLOR_BGR2RGB, dst=self._display_rgb)
             
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(pil_image)
+            # Wrap the RGB buffer without copying it
+            pil_image = Image.frombuffer("RGB", (width, height), self._display_rgb, "raw", "RGB", 0, 1)
             
-            # Update label
-            self.video_label.config(image=photo, text="")
-            self.video_label.image = photo  # Keep reference
+            if self._photo is None:
+                # New size - create the PhotoImage and attach it to the label
+                self._photo = ImageTk.PhotoImage(pil_image)
+                self.video_label.config(image=self._photo, text="")
+                self.video_label.image = self._photo  # Keep reference
+            else:
+                # Same size - update the existing Tk image in place
+                self._photo.paste(pil_image)
             
         except Exception as e:
             print(f"Display update error: {e}")
     
     def update_recognition_status(self, text):
-        """Update recognition status text"""
-        self.main_window.root.after(0, lambda: self.recognition_status.config(text=text))
+        """Update recognition status text (coalesced - only the latest text is applied)"""
+        self._pending_status = text
+        if self._status_scheduled or text == self._shown_status:
+            return
+        
+        self._status_scheduled = True
+        self.main_window.root.after_idle(self._flush_recognition_status)
+    
+    def _flush_recognition_status(self):
+        """Apply the latest pending recognition status on the Tk thread"""
+        self._status_scheduled = False
+        text = self._pending_status
+        if text != self._shown_status:
+            self.recognition_status.config(text=text)
+            self._shown_status = text
     
     def show_recognition_status(self, text, color="blue"):
         """Show recognition status with color"""
         def update_status():
             self.recognition_status.config(text=text, fg=color)
+            self._shown_status = text
         
         def reset_color():
             self.recognition_status.config(fg="blue")
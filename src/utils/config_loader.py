@@ -1,11 +1,25 @@
 # Enhanced src/utils/config_loader.py
 import json
 import os
+import copy
+import functools
+
+# Default config location: <project root>/config/system_config.json
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'config', 'system_config.json'
+)
+
+# Sections every config file must define
+REQUIRED_SECTIONS = frozenset({'video', 'motion_detection', 'face_detection', 'database'})
 
 def load_config(config_path=None):
     """
     Load configuration from JSON file with validation
     
+    The file is read and parsed once per path; each call gets its own deep
+    copy, so callers may modify it without affecting later loads.
+    
     Args:
         config_path: Path to config file (default: config/system_config.json)
         
@@ -13,17 +27,19 @@ def load_config(config_path=None):
         dict: Configuration dictionary
     """
     if config_path is None:
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        config_path = os.path.join(base_dir, 'config', 'system_config.json')
-    
+        config_path = DEFAULT_CONFIG_PATH
+    return copy.deepcopy(_load_config_file(os.path.abspath(config_path)))
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(config_path):
+    """Parse and validate one config file (memoized by absolute path - never mutate the result)"""
     with open(config_path, 'r') as f:
         config = json.load(f)
     
-    # Validate required sections
-    required_sections = ['video', 'motion_detection', 'face_detection', 'database']
-    for section in required_sections:
-        if section not in config:
-            raise ValueError(f"Missing required config section: {section}")
+    # Validate required sections - report all missing ones at once
+    missing = REQUIRED_SECTIONS - config.keys()
+    if missing:
+        raise ValueError(f"Missing required config sections: {', '.join(sorted(missing))}")
     
     return config
 